@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from dependencies import get_bd_client, get_pinecone_service, get_snapshot_manager
+from services.embeddings import get_embedding_backend
+from services.llm_cache import get_response_cache
+from services.page_cache import get_page_cache
+from services.parse_pool import get_parse_pool
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics():
+    embedding_cache = get_embedding_backend().cache
+    page_cache = get_page_cache()
+    return {
+        "llm_cache": get_response_cache().stats(),
+        "embedding_cache": embedding_cache.stats() if embedding_cache else {},
+        "bright_data_requests": get_bd_client().request_flight.stats(),
+        "serp_cache": get_bd_client().serp_cache_stats(),
+        "discovery_cache": get_pinecone_service().discovery_cache_stats(),
+        "page_cache": page_cache.stats() if page_cache else {},
+        "parse_pool": get_parse_pool().stats(),
+        "amazon_snapshots": get_snapshot_manager().stats(),
+    }
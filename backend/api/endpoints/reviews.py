@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from services.review_service import ReviewExtractionService
-from dependencies import get_review_service
+from services.snapshot_manager import SnapshotManager
+from dependencies import get_review_service, get_snapshot_manager
+from core.config import get_settings
 from pydantic import BaseModel
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
+import hmac
+import json
 import time
 
 
@@ -10,6 +15,7 @@ router = APIRouter(tags=["reviews"])
 
 class ReviewExtractionRequest(BaseModel):
     selected_products: Dict[str, Dict]
+    refresh: bool = False  # only fetch reviews newer than the stored ones
 
 class ReviewExtractionResponse(BaseModel):
     reviews: Dict[str, List[Dict]]
@@ -27,7 +33,8 @@ async def extract_reviews_handler(
         print(f"Extracting reviews for products: {list(request.selected_products.keys())}")
         
         reviews = await review_service.extract_reviews_for_products(
-            selected_products=request.selected_products
+            selected_products=request.selected_products,
+            refresh=request.refresh
         )
         
         extraction_time = time.time() - start_time
@@ -54,4 +61,51 @@ async def extract_reviews_with_slash(
     request: ReviewExtractionRequest,
     review_service: ReviewExtractionService = Depends(get_review_service)
 ):
-    return await extract_reviews_handler(request, review_service)
\ No newline at end of file
+    return await extract_reviews_handler(request, review_service)
+
+
+# streams reviews per store and page as they are parsed, then ingestion progress, as ndjson
+@router.post("/extract/stream")
+async def extract_reviews_stream(
+    request: ReviewExtractionRequest,
+    review_service: ReviewExtractionService = Depends(get_review_service)
+):
+    start_time = time.time()
+    print(f"Streaming reviews for products: {list(request.selected_products.keys())}")
+    
+    async def event_lines():
+        async for event in review_service.stream_reviews_for_products(request.selected_products, refresh=request.refresh):
+            event["elapsed_seconds"] = round(time.time() - start_time, 2)
+            yield json.dumps(event, default=str) + "\n"
+    
+    return StreamingResponse(event_lines(), media_type="application/x-ndjson")
+
+
+# bright data calls this when a triggered snapshot is ready, optionally pushing the rows
+@router.post("/snapshots/webhook")
+async def snapshot_webhook(
+    payload: Any = Body(...),
+    snapshot_id: Optional[str] = None,
+    authorization: Optional[str] = Header(default=None),
+    snapshot_manager: SnapshotManager = Depends(get_snapshot_manager)
+):
+    settings = get_settings()
+    if not settings.SNAPSHOT_WEBHOOK_URL:
+        raise HTTPException(status_code=404, detail="Not Found")
+    
+    # without a secret nobody can be authenticated, so nobody gets in
+    secret = settings.SNAPSHOT_WEBHOOK_SECRET
+    if not secret or not hmac.compare_digest((authorization or "").encode(), secret.encode()):
+        raise HTTPException(status_code=401, detail="Invalid webhook secret")
+
+    rows = None
+    if isinstance(payload, dict):
+        snapshot_id = payload.get("snapshot_id") or snapshot_id
+    elif isinstance(payload, list):
+        rows = payload
+
+    if not snapshot_id:
+        raise HTTPException(status_code=400, detail="Missing snapshot_id")
+
+    accepted = snapshot_manager.notify(snapshot_id, rows)
+    return {"snapshot_id": snapshot_id, "accepted": accepted}
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Dict
 
 
 class Settings(BaseSettings):
@@ -12,18 +13,95 @@ class Settings(BaseSettings):
     BRIGHT_DATA_SERP_ZONE: str = ""
     BRIGHT_DATA_WEBUNLOCKER_ZONE: str = ""
     
+    # amazon review dataset snapshots
+    AMAZON_REVIEWS_DATASET_ID: str = "gd_le8e811kzy4ggddlq"
+    SNAPSHOT_BATCH_WINDOW_SECONDS: float = 0.5
+    SNAPSHOT_MAX_BATCH_SIZE: int = 20
+    SNAPSHOT_POLL_MIN_SECONDS: float = 2.0
+    SNAPSHOT_POLL_MAX_SECONDS: float = 20.0
+    SNAPSHOT_TIMEOUT_SECONDS: float = 120.0
+    SNAPSHOT_WEBHOOK_URL: str = ""  # public url of /api/v1/reviews/snapshots/webhook
+    SNAPSHOT_WEBHOOK_SECRET: str = ""  # required, the webhook rejects every call without it
+    MAX_REVIEWS_PER_STORE: int = 100
+    
+    # walmart review pages
+    WALMART_MAX_REVIEW_PAGES: int = 10
+    WALMART_REVIEW_PAGE_CONCURRENCY: int = 3
+    
+    # outbound http pool
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_POOL_LIMIT_PER_HOST: int = 20
+    HTTP_DNS_CACHE_TTL_SECONDS: int = 300
+    HTTP_KEEPALIVE_TIMEOUT_SECONDS: float = 60.0
+    HTTP_TIMEOUT_SECONDS: float = 30.0
+    
     # Pinecone configuration
     PINECONE_API_KEY: str = ""
     PINECONE_ENVIRONMENT: str = ""
     PINECONE_DISCOVERY_INDEX: str = ""
     PINECONE_REVIEWS_INDEX: str = ""
     
+    # vector store configuration
+    VECTOR_STORE_BACKEND: str = "pinecone"  # "pinecone" or "local"
+    LOCAL_VECTOR_HNSW_THRESHOLD: int = 20000
+    VECTOR_CLIENT_MAX_WORKERS: int = 8
+    
+    # review ingestion pipeline
+    INGESTION_EMBED_BATCH_SIZE: int = 64
+    INGESTION_UPSERT_BATCH_SIZE: int = 100
+    INGESTION_QUEUE_SIZE: int = 4
+    INGESTION_UPSERT_WORKERS: int = 2
+    REVIEW_DEDUP_ENABLED: bool = True
+    REVIEW_DEDUP_THRESHOLD: float = 0.8
+    
+    # incremental review refresh
+    REVIEW_REFRESH_ENABLED: bool = True
+    REVIEW_WATERMARK_TTL_DAYS: int = 90
+    
+    # discovery cache
+    DISCOVERY_SEMANTIC_CACHE_ENABLED: bool = True
+    DISCOVERY_SEMANTIC_THRESHOLD: float = 0.9
+    DISCOVERY_SEMANTIC_TOP_K: int = 5
+    
     # other configuration
     CACHE_EXPIRY_DAYS: int = 7
     MAX_PRODUCTS_PER_STORE: int = 5
     GEMINI_API_KEY: str | None = None
+    GEMINI_TIMEOUT_SECONDS: int = 25
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ITEMS: int = 512
+    LLM_CACHE_TTL_SECONDS: int = 3600
     HUGGINGFACE_API_KEY: str = ""
 
+    # embedding configuration
+    EMBEDDING_BACKEND: str = "huggingface"  # "huggingface" or "local"
+    EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_DIMENSION: int = 384
+    EMBEDDING_BATCH_SIZE: int = 128
+    EMBEDDING_MAX_WORKERS: int = 4
+    EMBEDDING_USE_ONNX: bool = False
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MEMORY_ITEMS: int = 10000
+    EMBEDDING_CACHE_DISK_MAX_ITEMS: int = 200000
+
+    # local cache storage, per instance: with several instances each keeps its own copy
+    LOCAL_CACHE_DIR: str = ".cache"
+    KV_CACHE_BACKEND: str = "sqlite"
+    SEEN_REVIEWS_MEMORY_NAMESPACES: int = 256
+    
+    # html parsing
+    PARSE_POOL_WORKERS: int = 2
+    
+    # scraped page cache
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    PAGE_CACHE_TTL_SECONDS: int = 21600
+    PAGE_CACHE_ZONE_TTL_SECONDS: Dict[str, int] = {}
+    
+    # per-store search result urls
+    SERP_CACHE_ENABLED: bool = True
+    SERP_CACHE_TTL_SECONDS: int = 86400
+
     
 
     model_config = SettingsConfigDict(
@@ -1,15 +1,44 @@
 from services.brightdata import BrightDataClient
+from services.http_transport import get_http_transport
+from services.parse_pool import get_parse_pool
+from services.snapshot_manager import SnapshotManager
+from core.config import get_settings
 from functools import lru_cache
 from services.review_service import ReviewExtractionService
 from services.analysis_service import AnalysisService
+from services.pinecone_service import PineconeService
 
 @lru_cache
 def get_bd_client() -> BrightDataClient:
     return BrightDataClient()
 
+@lru_cache
+def get_snapshot_manager() -> SnapshotManager:
+    settings = get_settings()
+    
+    # the webhook rejects every call without a secret, so don't ask bright data to call it
+    notify_url = settings.SNAPSHOT_WEBHOOK_URL
+    if notify_url and not settings.SNAPSHOT_WEBHOOK_SECRET:
+        print("SNAPSHOT_WEBHOOK_URL is set without SNAPSHOT_WEBHOOK_SECRET, snapshots will be polled only")
+        notify_url = ""
+    
+    return SnapshotManager(
+        get_bd_client(),
+        dataset_id=settings.AMAZON_REVIEWS_DATASET_ID,
+        batch_window_seconds=settings.SNAPSHOT_BATCH_WINDOW_SECONDS,
+        max_batch_size=settings.SNAPSHOT_MAX_BATCH_SIZE,
+        poll_min_seconds=settings.SNAPSHOT_POLL_MIN_SECONDS,
+        poll_max_seconds=settings.SNAPSHOT_POLL_MAX_SECONDS,
+        timeout_seconds=settings.SNAPSHOT_TIMEOUT_SECONDS,
+        max_rows_per_url=settings.MAX_REVIEWS_PER_STORE,
+        notify_url=notify_url,
+        notify_secret=settings.SNAPSHOT_WEBHOOK_SECRET
+    )
+
 async def cleanup_bd_client():
-    client = get_bd_client()
-    await client.close()
+    await get_snapshot_manager().close()
+    await get_http_transport().close()
+    get_parse_pool().close()
     
 @lru_cache
 def get_proxy_url() -> str:
@@ -17,13 +46,25 @@ def get_proxy_url() -> str:
     return client.proxy_url
 
 
+@lru_cache
+def get_pinecone_service() -> PineconeService:
+    return PineconeService()
+
+
 @lru_cache
 def get_product_service():
     from services.product_service import ProductService
-    return ProductService(bright_data_client=get_bd_client())
+    return ProductService(
+        bright_data_client=get_bd_client(),
+        pinecone_service=get_pinecone_service()
+    )
 
 def get_review_service() -> ReviewExtractionService:
-    return ReviewExtractionService()
+    return ReviewExtractionService(
+        bright_data_client=get_bd_client(),
+        pinecone_service=get_pinecone_service(),
+        snapshot_manager=get_snapshot_manager()
+    )
 
 def get_analysis_service():
-    return AnalysisService()
\ No newline at end of file
+    return AnalysisService(pinecone_service=get_pinecone_service())
\ No newline at end of file
@@ -1,134 +1,108 @@
 from extractors.base import BaseProductExtractor
 from datetime import datetime
-from bs4 import BeautifulSoup
+from extractors.spec import ExtractionSpec, Field, Rule, to_int, to_price
+from services.parse_pool import get_parse_pool
 import re
 
+# only the subtrees the spec's fragment rules read
+PRODUCT_XPATH = " | ".join([
+    "//span[" + " or ".join([
+        "@id='productTitle'",
+        "contains(@class, 'a-offscreen')",
+        "contains(@class, 'priceToPay')",
+        "contains(@class, 'a-icon-alt')",
+        "@data-hook='rating-out-of-text'",
+        "@id='acrCustomerReviewText'",
+        "@aria-label",
+    ]) + "]",
+    "//i[@data-hook='average-star-rating']",
+    "//img[@id='landingImage']",
+    "//div[@id='prodDetails']",
+])
+
+OUT_OF_FIVE = re.compile(r"([0-5](?:\.\d)?)\s*out of 5")
+
+
+def _price_to_pay(tag) -> float:
+    whole = tag.find("span", class_="a-price-whole")
+    fraction = tag.find("span", class_="a-price-fraction")
+    if whole and fraction:
+        try:
+            return float(whole.get_text(strip=True).replace(",", "") + "." + fraction.get_text(strip=True))
+        except ValueError:
+            return None
+    return None
+
+
+def _details_text(tag) -> str:
+    spec_text = ""
+    for table in tag.find_all("table"):
+        for row in table.find_all("tr"):
+            th = row.find("th")
+            td = row.find("td")
+            if th and td:
+                spec_text += f"{th.get_text(strip=True)}: {td.get_text(strip=True)}\n"
+    return spec_text or None
+
+
+PRODUCT_SPEC = ExtractionSpec(
+    fragment=PRODUCT_XPATH,
+    fields=[
+        Field("name", [Rule("span#productTitle")]),
+        Field("price", [
+            Rule("span.a-offscreen", pattern=r"\$([\d,.]+)", convert=to_price),
+            Rule("span.priceToPay", extract=_price_to_pay, limit=1),
+            # first dollar amount anywhere in the page text, as one scan of the root element
+            Rule(":root", separator=" ", pattern=r"\$([\d,]+\.\d{2})", convert=to_price, limit=1, full_page=True),
+        ]),
+        Field("rating", [
+            Rule('i[data-hook="average-star-rating"] span.a-icon-alt', pattern=OUT_OF_FIVE, convert=float),
+            Rule("span.a-icon-alt", pattern=OUT_OF_FIVE, convert=float, limit=1),
+            Rule('span[data-hook="rating-out-of-text"]', pattern=OUT_OF_FIVE, convert=float, limit=1),
+            # bounded so a page without a rating never scans every span
+            Rule("span", pattern=OUT_OF_FIVE, convert=float, limit=2000, full_page=True),
+        ], default=0.0),
+        Field("review_count", [
+            Rule("span#acrCustomerReviewText", pattern=r"([\d,]+)", convert=to_int, limit=1),
+            Rule('span[aria-label*="reviews" i]', attr="aria-label", pattern=r"([\d,]+)", convert=to_int, limit=1),
+        ], default=0),
+        Field("image_url", [Rule("img#landingImage", attr="src", limit=1)]),
+        Field("specifications_raw", [Rule("div#prodDetails", extract=_details_text, limit=1)], default=""),
+    ]
+)
+
+
+def is_product_page(html: str) -> bool:
+    """Cheap check that a fetched page is a product page and not a captcha or error page"""
+    return "productTitle" in html and "validateCaptcha" not in html
+
+
+def parse_product_page(html: str, url: str) -> dict:
+    """Extracts product fields from an Amazon product page, runs in the parse pool"""
+    values = PRODUCT_SPEC.extract(html)
+    return {
+        "id": None,
+        "name": values["name"],
+        "url": url,
+        "source": "amazon",
+        "price": values["price"],
+        "review_count": values["review_count"],
+        "last_scraped": datetime.now(),
+        "specifications_raw": values["specifications_raw"],
+        "specifications": {},
+        "rating": values["rating"],
+        "image_url": values["image_url"],
+    }
+
+
 class AmazonExtractor(BaseProductExtractor):
     def __init__(self, bright_data_client):
         self.bright_data = bright_data_client
 
     async def extract_product_info(self, url: str) -> dict:
         try:
-            html = await self.bright_data.get_product_page(url)
-            soup = BeautifulSoup(html, "html.parser")
-
-            title_el = soup.find("span", id="productTitle")
-            name = title_el.get_text(strip=True) if title_el else None
-
-            price = None
-
-            offscreen_spans = soup.find_all("span", class_="a-offscreen")
-            for span in offscreen_spans:
-                price_text = span.get_text(strip=True)
-                match = re.search(r"\$([\d,.]+)", price_text)
-                if match:
-                    try:
-                        price = float(match.group(1).replace(",", ""))
-                        break
-                    except Exception:
-                        continue
-
-            if price is None:
-                price_to_pay = soup.find("span", class_="priceToPay")
-                if price_to_pay:
-                    whole = price_to_pay.find("span", class_="a-price-whole")
-                    fraction = price_to_pay.find("span", class_="a-price-fraction")
-                    if whole and fraction:
-                        try:
-                            price = float(whole.get_text(strip=True).replace(",", "") + "." + fraction.get_text(strip=True))
-                        except Exception:
-                            price = None
-
-            if price is None:
-                text = soup.get_text(" ", strip=True)
-                match = re.search(r"\$([\d,]+\.\d{2})", text)
-                if match:
-                    try:
-                        price = float(match.group(1).replace(",", ""))
-                    except Exception:
-                        price = None
-
-            rating, review_count = None, None
-            rating = None
-
-            histogram = soup.find("i", attrs={"data-hook": "average-star-rating"})
-            if histogram:
-                alt = histogram.find("span", class_="a-icon-alt")
-                if alt:
-                    match = re.search(r"([0-5](?:\.\d)?)\s*out of 5", alt.get_text(strip=True))
-                    if match:
-                        rating = float(match.group(1))
-
-            if rating is None:
-                alt = soup.find("span", class_="a-icon-alt")
-                if alt:
-                    match = re.search(r"([0-5](?:\.\d)?)\s*out of 5", alt.get_text(strip=True))
-                    if match:
-                        rating = float(match.group(1))
-
-            if rating is None:
-                rating_text = soup.find("span", attrs={"data-hook": "rating-out-of-text"})
-                if rating_text:
-                    match = re.search(r"([0-5](?:\.\d)?)\s*out of 5", rating_text.get_text(strip=True))
-                    if match:
-                        rating = float(match.group(1))
-
-            if rating is None:
-                for span in soup.find_all("span"):
-                    text = span.get_text(strip=True)
-                    match = re.search(r"([0-5](?:\.\d)?)\s*out of 5", text)
-                    if match:
-                        rating = float(match.group(1))
-                        break
-            review_count_el = soup.find("span", id="acrCustomerReviewText")
-            if review_count_el:
-                text = review_count_el.get_text(strip=True)
-                match = re.search(r"([\d,]+)", text)
-                if match:
-                    review_count = int(match.group(1).replace(",", ""))
-            else:
-                review_count_el = soup.find("span", attrs={"aria-label": re.compile(r"Reviews", re.I)})
-                if review_count_el and review_count_el.has_attr("aria-label"):
-                    match = re.search(r"([\d,]+)", review_count_el["aria-label"])
-                    if match:
-                        review_count = int(match.group(1).replace(",", ""))
-
-            image_url = None
-            img_el = soup.find("img", id="landingImage")
-            if img_el:
-                image_url = img_el.get("src")
-
-            spec_text = ""
-            prod_details_div = soup.find("div", id="prodDetails")
-            if prod_details_div:
-                details_tables = prod_details_div.find_all("table")
-                for table in details_tables:
-                    for row in table.find_all("tr"):
-                        th = row.find("th")
-                        td = row.find("td")
-                        if th and td:
-                            label = th.get_text(strip=True)
-                            value = td.get_text(strip=True)
-                            spec_text += f"{label}: {value}\n"
-
-            if rating is None:
-                rating = 0.0
-            if review_count is None:
-                review_count = 0
-            
-            return {
-                "id": None,
-                "name": name,
-                "url": url,
-                "source": "amazon",
-                "price": price,
-                "review_count": review_count,
-                "last_scraped": datetime.now(),
-                "specifications_raw": spec_text,
-                "specifications": {},
-                "rating": rating,
-                "image_url": image_url,
-            }
+            html = await self.bright_data.get_product_page(url, is_valid=is_product_page)
+            return await get_parse_pool().run(parse_product_page, html, url)
 
         except Exception as e:
             print(f"Error during amazon extraction: {str(e)}")
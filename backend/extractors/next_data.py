@@ -0,0 +1,33 @@
+from collections import deque
+from typing import Any, Callable, Optional
+import json
+import re
+
+_NEXT_DATA_RE = re.compile(r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I)
+
+
+def load_next_data(html: str) -> Optional[dict]:
+    """Decodes the __NEXT_DATA__ JSON blob that Next.js pages embed, None when missing"""
+    match = _NEXT_DATA_RE.search(html or "")
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(1))
+    except json.JSONDecodeError as e:
+        print(f"Error decoding __NEXT_DATA__: {e}")
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def find_key(data: Any, key: str, accept: Optional[Callable[[Any], bool]] = None) -> Any:
+    """Returns the first value stored under `key` anywhere in the tree (breadth first)"""
+    queue = deque([data])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, dict):
+            if key in node and (accept is None or accept(node[key])):
+                return node[key]
+            queue.extend(node.values())
+        elif isinstance(node, list):
+            queue.extend(node)
+    return None
@@ -0,0 +1,24 @@
+from typing import List
+from utils.html_parser import parse_html
+import re
+
+
+def parse_product_urls(html: str, pattern: str, max_results: int) -> List[str]:
+    """Collects product links matching the store pattern from a SERP page, runs in the parse pool"""
+    soup = parse_html(html, only="//a[@href]")
+    all_links = [
+        a.get('href') for a in soup.select('a[href]')
+        if a.get('href') and a.get('href').startswith('http')
+    ]
+
+    product_urls = []
+    for url in all_links:
+        if pattern and re.search(pattern, url):
+            clean_url = url.split('&utm_')[0].split('?utm_')[0]
+            if clean_url not in product_urls:
+                product_urls.append(clean_url)
+
+            if len(product_urls) >= max_results:
+                break
+
+    return product_urls[:max_results]
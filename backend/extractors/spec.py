@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Pattern, Union
+import re
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+from utils.html_parser import parse_html
+
+
+@dataclass
+class Rule:
+    """One way of reading a field: the first element matching `selector` that yields a value.
+
+    The raw value is the element's text (or `attr`). `pattern` keeps its first
+    group and `convert` turns the string into the final value; `extract`
+    replaces all of that with a function of the element. `limit` bounds how
+    many matching elements are tried, and `full_page` rules only run against
+    the full page when the fragment pass left the field empty.
+    """
+    selector: str
+    attr: Optional[str] = None
+    pattern: Optional[Union[str, Pattern]] = None
+    convert: Optional[Callable[[str], Any]] = None
+    extract: Optional[Callable[[Tag], Any]] = None
+    separator: str = ""
+    limit: Optional[int] = None
+    full_page: bool = False
+
+    def __post_init__(self):
+        self.compiled = soupsieve.compile(self.selector)
+        if isinstance(self.pattern, str):
+            self.pattern = re.compile(self.pattern)
+
+    def value(self, tag: Tag) -> Any:
+        if self.extract is not None:
+            return self.extract(tag)
+
+        raw = tag.get(self.attr) if self.attr else tag.get_text(self.separator, strip=True)
+        if isinstance(raw, list):
+            raw = " ".join(raw)
+        if not raw:
+            return None
+
+        if self.pattern is not None:
+            match = self.pattern.search(raw)
+            if not match:
+                return None
+            raw = match.group(1) if match.groups() else match.group(0)
+
+        if self.convert is not None:
+            try:
+                return self.convert(raw)
+            except (TypeError, ValueError):
+                return None
+        return raw
+
+
+@dataclass
+class Field:
+    name: str
+    rules: List[Rule]
+    default: Any = None
+
+
+@dataclass
+class ExtractionSpec:
+    """Declarative extraction spec for one store's pages.
+
+    Selectors and regexes are compiled when the spec is built (at import).
+    `fragment` is the XPath handed to the partial parser; rules marked
+    `full_page` are only evaluated on a full parse, and only for fields the
+    fragment pass could not fill.
+    """
+    fields: List[Field]
+    fragment: Optional[str] = None
+    _fallback_fields: List[Field] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._fallback_fields = [f for f in self.fields if any(rule.full_page for rule in f.rules)]
+
+    def extract(self, html: str) -> Dict[str, Any]:
+        soup = parse_html(html, only=self.fragment)
+        values = _run_pass(soup, self.fields, full_page=False)
+
+        missing = [f for f in self._fallback_fields if values.get(f.name) is None]
+        if missing:
+            full_soup = parse_html(html) if self.fragment else soup
+            values.update(_run_pass(full_soup, missing, full_page=True))
+
+        return {f.name: values[f.name] if values.get(f.name) is not None else f.default for f in self.fields}
+
+
+def _run_pass(soup: BeautifulSoup, fields: List[Field], full_page: bool) -> Dict[str, Any]:
+    """Walks the tree once, keeping for each field the value of its highest-priority rule"""
+    rules = [
+        (field_index, rule_index, rule)
+        for field_index, f in enumerate(fields)
+        for rule_index, rule in enumerate(f.rules)
+        if rule.full_page == full_page
+    ]
+    best_rule = [len(f.rules) for f in fields]
+    best_value: List[Any] = [None] * len(fields)
+    attempts = [0] * len(rules)
+    unresolved = len(fields)
+    first_rule = [min((r for fi, r, _ in rules if fi == i), default=0) for i in range(len(fields))]
+
+    for tag in soup.find_all(True):
+        for position, (field_index, rule_index, rule) in enumerate(rules):
+            if rule_index >= best_rule[field_index]:
+                continue
+            if rule.limit is not None and attempts[position] >= rule.limit:
+                continue
+            if not rule.compiled.match(tag):
+                continue
+
+            attempts[position] += 1
+            value = rule.value(tag)
+            if value is None:
+                continue
+
+            if best_rule[field_index] == len(fields[field_index].rules):
+                unresolved -= 1
+            best_rule[field_index] = rule_index
+            best_value[field_index] = value
+
+        # stop once every field holds the value of its first rule
+        if unresolved == 0 and all(best_rule[i] == first_rule[i] for i in range(len(fields))):
+            break
+
+    return {f.name: best_value[i] for i, f in enumerate(fields)}
+
+
+def to_price(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def to_int(text: str) -> int:
+    return int(text.replace(",", ""))
@@ -3,7 +3,133 @@ from extractors.base import BaseProductExtractor
 from models.product import Product
 import re
 from datetime import datetime
-from bs4 import BeautifulSoup
+from extractors.next_data import find_key, load_next_data
+from extractors.spec import ExtractionSpec, Field, Rule, to_price
+from services.parse_pool import get_parse_pool
+
+# only the subtrees the extractor reads
+PRODUCT_XPATH = " | ".join([
+    "//h1[@id='main-title']",
+    "//span[@itemprop='price']",
+    "//div[@data-testid='reviews-and-ratings']",
+    "//img[@data-testid='hero-image']",
+    "//div[@data-testid='media-thumbnail']",
+    "//section[.//h2[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'about this item')]]",
+])
+
+ABOUT_THIS_ITEM = re.compile("About this item", re.I)
+
+
+def _about_this_item(tag) -> str:
+    heading = tag.find("h2", string=ABOUT_THIS_ITEM)
+    if not heading or heading.find_parent("section") is not tag:
+        return None
+    ul = tag.find("ul")
+    if not ul:
+        return None
+    return "\n".join(li.get_text(strip=True) for li in ul.find_all("li"))
+
+
+# DOM fallback when the page has no __NEXT_DATA__
+RATINGS_BLOCK = 'div[data-testid="reviews-and-ratings"]'
+PRODUCT_SPEC = ExtractionSpec(
+    fragment=PRODUCT_XPATH,
+    fields=[
+        Field("name", [Rule("h1#main-title", limit=1)]),
+        Field("price", [Rule('span[itemprop="price"]', pattern=r"\$?([\d,.]+)", convert=to_price, limit=1)]),
+        Field("rating", [
+            Rule(RATINGS_BLOCK, pattern=r"([0-5](?:\.\d)?)\s*stars?", convert=float, separator=" ", limit=1),
+            Rule(RATINGS_BLOCK, pattern=r"\((\d(?:\.\d)?)\)", convert=float, separator=" ", limit=1),
+            Rule(RATINGS_BLOCK, pattern=r"\b([0-5](?:\.\d)?)\b", convert=float, separator=" ", limit=1),
+        ], default=0.0),
+        Field("review_count", [
+            Rule(RATINGS_BLOCK, pattern=r"out of\s+(\d+)", convert=int, separator=" ", limit=1),
+            Rule(RATINGS_BLOCK, pattern=r"(\d+)\s+(?:ratings|reviews)", convert=int, separator=" ", limit=1),
+        ], default=0),
+        Field("image_url", [
+            Rule('img[data-testid="hero-image"]', attr="src", limit=1),
+            Rule('div[data-testid="media-thumbnail"] img', attr="src", limit=1),
+        ]),
+        Field("specifications_raw", [Rule("section", extract=_about_this_item)], default=""),
+    ]
+)
+
+
+def _to_float(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _product_from_next_data(html: str, url: str):
+    next_data = load_next_data(html)
+    if next_data is None:
+        return None
+
+    product = find_key(next_data, "product", lambda value: isinstance(value, dict) and value.get("name"))
+    if product is None:
+        return None
+
+    price_info = product.get("priceInfo") or {}
+    price = _to_float((price_info.get("currentPrice") or {}).get("price"))
+
+    rating = _to_float(product.get("averageRating"))
+    review_count = product.get("numberOfReviews")
+
+    image_url = (product.get("imageInfo") or {}).get("thumbnailUrl")
+
+    specifications = find_key(next_data, "specifications", lambda value: isinstance(value, list) and value) or []
+    spec_text = "\n".join(
+        f"{spec.get('name')}: {spec.get('value')}"
+        for spec in specifications
+        if isinstance(spec, dict) and spec.get("name") and spec.get("value")
+    )
+
+    return {
+        "id": None,
+        "name": product["name"],
+        "url": url,
+        "source": "walmart",
+        "price": price,
+        "review_count": int(_to_float(review_count) or 0),
+        "last_scraped": datetime.now(),
+        "specifications_raw": spec_text,
+        "specifications": {},
+        "rating": rating if rating is not None else 0.0,
+        "image_url": image_url,
+    }
+
+
+def is_product_page(html: str) -> bool:
+    """Cheap check that a fetched page is a product page and not the bot challenge"""
+    return "Robot or human" not in html and ("__NEXT_DATA__" in html or "main-title" in html)
+
+
+def parse_product_page(html: str, url: str) -> dict:
+    """Extracts product fields from a Walmart product page, runs in the parse pool.
+
+    The page's __NEXT_DATA__ JSON is used when present, otherwise the DOM.
+    """
+    product = _product_from_next_data(html, url)
+    if product is not None:
+        return product
+
+    values = PRODUCT_SPEC.extract(html)
+    return {
+        "id": None,
+        "name": values["name"],
+        "url": url,
+        "source": "walmart",
+        "price": values["price"],
+        "review_count": values["review_count"],
+        "last_scraped": datetime.now(),
+        "specifications_raw": values["specifications_raw"],
+        "specifications": {},
+        "rating": values["rating"],
+        "image_url": values["image_url"],
+    }
+
 
 class WalmartExtractor(BaseProductExtractor):
     def __init__(self, bright_data_client):
@@ -11,86 +137,9 @@ class WalmartExtractor(BaseProductExtractor):
     
     async def extract_product_info(self, url: str) -> Product: 
         try:
-            html = await self.bright_data.get_product_page(url)
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Title
-            title_el = soup.find("h1", id="main-title")
-            name = title_el.get_text(strip=True) if title_el else None
-
-            # Price
-            price = None
-            price_el = soup.find("span", itemprop="price")
-            if price_el:
-                price_text = price_el.get_text(strip=True)
-                match = re.search(r"\$?([\d,.]+)", price_text)
-                if match:
-                    try:
-                        price = float(match.group(1).replace(",", ""))
-                    except Exception:
-                        price = None
-
-            # rating and review count
-            rating, review_count = None, None
-            reviews_block = soup.find("div", {"data-testid": "reviews-and-ratings"})
-            if reviews_block:
-                text = reviews_block.get_text(" ", strip=True)
-                rating_match = re.search(r"([0-5](?:\.\d)?)\s*stars?", text)
-                if not rating_match:
-                    rating_match = re.search(r"\((\d(?:\.\d)?)\)", text)
-                if not rating_match:
-                    rating_match = re.search(r"\b([0-5](?:\.\d)?)\b", text)
-                if rating_match:
-                    try:
-                        rating = float(rating_match.group(1))
-                    except Exception:
-                        rating = None
-                count_match = re.search(r"out of\s+(\d+)", text)
-                if not count_match:
-                     count_match = re.search(r"(\d+)\s+(?:ratings|reviews)", text)
-                if count_match:
-                    review_count = int(count_match.group(1))
-
-            # image url
-            image_url = None
-            img_el = soup.find("img", {"data-testid": "hero-image"})
-            if img_el:
-                image_url = img_el.get("src")
-            if not image_url:
-                thumb_div = soup.find("div", {"data-testid": "media-thumbnail"})
-                if thumb_div:
-                    img_tag = thumb_div.find("img")
-                    if img_tag:
-                        image_url = img_tag.get("src")
-
-            about_section = soup.find("h2", string=re.compile("About this item", re.I))
-            spec_text = ""
-            if about_section:
-                parent = about_section.find_parent("section")
-                if parent:
-                    ul = parent.find("ul")
-                    if ul:
-                        spec_text = "\n".join(li.get_text(strip=True) for li in ul.find_all("li"))
-            
-            if rating is None:
-                rating = 0.0
-            if review_count is None:
-                review_count = 0
-            
-            return {
-                "id": None,
-                "name": name,
-                "url": url,
-                "source": "walmart",
-                "price": price,
-                "review_count": review_count,
-                "last_scraped": datetime.now(),
-                "specifications_raw": spec_text,
-                "specifications": {},
-                "rating": rating,
-                "image_url": image_url,
-            }
-        
+            html = await self.bright_data.get_product_page(url, is_valid=is_product_page)
+            return await get_parse_pool().run(parse_product_page, html, url)
+
         except Exception as e:
             print(f"Error during walmart extraction: {str(e)}")
             raise
@@ -0,0 +1,221 @@
+from typing import Dict, List, Optional
+from extractors.next_data import find_key, load_next_data
+from utils.html_parser import parse_html
+import math
+import re
+
+PAGINATION_XPATH = "//nav[@aria-label='pagination']"
+REVIEW_PAGE_XPATH = f"//div[contains(@class, 'overflow-visible')] | {PAGINATION_XPATH}"
+
+
+def _reviews_data(html: str) -> Optional[Dict]:
+    next_data = load_next_data(html)
+    if next_data is None:
+        return None
+    return find_key(next_data, "reviews", lambda value: isinstance(value, dict) and "customerReviews" in value)
+
+
+def _review_from_json(review: Dict, product_name: str) -> Optional[Dict]:
+    review_text = (review.get("reviewText") or "").strip()
+    try:
+        rating = int(float(review.get("rating") or 0))
+    except (TypeError, ValueError):
+        rating = 0
+    if not review_text or rating <= 0:
+        return None
+
+    badges = review.get("badges") or []
+    verified_purchase = any(
+        isinstance(badge, dict) and "verified" in str(badge.get("id") or badge.get("badgeType") or "").lower()
+        for badge in badges
+    )
+
+    return {
+        "review_text": review_text,
+        "title": review.get("reviewTitle") or "",
+        "rating": rating,
+        "review_date": review.get("reviewSubmissionTime") or "",
+        "helpful_votes": review.get("positiveFeedback") or 0,
+        "product_name": product_name,
+        "author_name": review.get("userNickname") or "",
+        "verified_purchase": verified_purchase
+    }
+
+
+def _reviews_from_json(reviews_data: Dict, product_name: str) -> List[Dict]:
+    reviews = []
+    for review in reviews_data.get("customerReviews") or []:
+        review_data = _review_from_json(review, product_name) if isinstance(review, dict) else None
+        if review_data:
+            reviews.append(review_data)
+    return reviews
+
+
+def _total_pages_from_json(reviews_data: Dict) -> int:
+    pages = (reviews_data.get("pagination") or {}).get("pages") or []
+    page_numbers = [page.get("num") for page in pages if isinstance(page, dict) and isinstance(page.get("num"), int)]
+    if page_numbers:
+        return max(page_numbers)
+
+    total_reviews = reviews_data.get("totalReviewCount") or 0
+    page_size = len(reviews_data.get("customerReviews") or [])
+    if total_reviews and page_size:
+        return max(1, math.ceil(total_reviews / page_size))
+    return 1
+
+
+def _review_containers(soup) -> List:
+    review_containers = soup.find_all("div", class_=lambda x: x and "overflow-visible" in x and "b--none" in x and "dark-gray" in x)
+
+    if not review_containers:
+        review_containers = soup.find_all("div", class_="overflow-visible")
+        review_containers = [container for container in review_containers if
+                        container.find("div", class_="f7 gray flex flex-auto flex-none-l tr tl-l justify-end justify-start-l")]
+    return review_containers
+
+
+def _reviews_from_containers(review_containers: List, product_name: str) -> List[Dict]:
+    reviews = []
+    for container in review_containers:
+        try:
+            review_data = _parse_review_container(container, product_name)
+            if review_data:
+                reviews.append(review_data)
+        except Exception:
+            continue
+    return reviews
+
+
+def _total_pages_from_soup(soup) -> int:
+    pagination = soup.find("nav", {"aria-label": "pagination"})
+    if not pagination:
+        return 1
+
+    page_links = pagination.find_all("a", {"data-automation-id": "page-number"})
+    if not page_links:
+        return 1
+
+    max_page = 1
+    for link in page_links:
+        try:
+            page_num = int(link.get_text(strip=True))
+            max_page = max(max_page, page_num)
+        except (ValueError, TypeError):
+            continue
+
+    return max_page
+
+
+def is_review_page(html: str) -> bool:
+    """Cheap check that a fetched page is a review page and not the bot challenge"""
+    return "Robot or human" not in html and ("__NEXT_DATA__" in html or "overflow-visible" in html)
+
+
+def parse_review_page(html: str, product_name: str) -> List[Dict]:
+    """Extracts the reviews on one Walmart review page, runs in the parse pool.
+
+    Reviews are read from the page's __NEXT_DATA__ JSON; the DOM is only
+    walked when the blob is missing.
+    """
+    reviews_data = _reviews_data(html)
+    if reviews_data is not None:
+        return _reviews_from_json(reviews_data, product_name)
+
+    soup = parse_html(html, only=REVIEW_PAGE_XPATH)
+    return _reviews_from_containers(_review_containers(soup), product_name)
+
+
+def parse_first_page(html: str, product_name: str) -> Dict:
+    """Parses page 1 once for its reviews plus what the page planner needs"""
+    reviews_data = _reviews_data(html)
+    if reviews_data is not None:
+        return {
+            "reviews": _reviews_from_json(reviews_data, product_name),
+            "page_size": len(reviews_data.get("customerReviews") or []),
+            "total_pages": _total_pages_from_json(reviews_data),
+            "review_count": reviews_data.get("totalReviewCount") or 0,
+        }
+
+    soup = parse_html(html, only=REVIEW_PAGE_XPATH)
+    review_containers = _review_containers(soup)
+    return {
+        "reviews": _reviews_from_containers(review_containers, product_name),
+        "page_size": len(review_containers),
+        "total_pages": _total_pages_from_soup(soup),
+        "review_count": 0,
+    }
+
+
+# extracting one review container
+def _parse_review_container(container, product_name: str) -> Optional[Dict]:
+    try:
+        # extracting date
+        date_elem = container.find("div", class_=lambda x: x and "f7" in x and "gray" in x and "flex" in x and "justify-end" in x)
+        if not date_elem:
+            date_elem = container.find("div", class_="f7 gray flex flex-auto flex-none-l tr tl-l justify-end justify-start-l")
+        review_date = date_elem.get_text(strip=True) if date_elem else ""
+
+        # extracting reviewer name
+        name_elem = container.find("span", class_=lambda x: x and "f7" in x and "b" in x and "mv0" in x)
+        if not name_elem:
+            name_elem = container.find("span", class_="f7 b mv0")
+        reviewer_name = name_elem.get_text(strip=True) if name_elem else ""
+
+        # extracting rating
+        star_container = container.find("div", class_=lambda x: x and "w_ExHd" in x and "w_y6ym" in x)
+        rating = 0
+        if star_container:
+            filled_stars = star_container.find_all("svg", class_=lambda x: x and "w_1jp4" in x)
+            rating = len(filled_stars)
+
+        # extracting review title
+        title_elem = container.find("h3", class_=lambda x: x and "w_kV33" in x and "w_Sl3f" in x and "w_mvVb" in x)
+        if not title_elem:
+            title_elem = container.find("h3", class_="w_kV33 w_Sl3f w_mvVb f5 b")
+        review_title = title_elem.get_text(strip=True) if title_elem else ""
+
+        # extracting review text
+        text_container = container.find("span", class_=lambda x: x and "tl-m" in x and "db-m" in x)
+        review_text = ""
+        if text_container:
+            for b_tag in text_container.find_all("b"):
+                b_tag.decompose()
+            review_text = text_container.get_text(strip=True)
+
+        # extracting helpful votes
+        helpful_votes = 0
+        upvote_buttons = container.find_all("button", {"aria-label": lambda x: x and "Upvote" in x})
+        for upvote_button in upvote_buttons:
+            vote_span = upvote_button.find("span", class_=lambda x: x and "ml1" in x and "f7" in x and "dark-gray" in x)
+            if vote_span:
+                vote_text = vote_span.get_text(strip=True)
+                vote_match = re.search(r'\((\d+)\)', vote_text)
+                if vote_match:
+                    helpful_votes = int(vote_match.group(1))
+                    break
+
+        # extracting verified purchase status
+        verified_purchase = False
+        verified_elems = container.find_all("span", class_=lambda x: x and "b" in x and "f7" in x and "dark-gray" in x)
+        for elem in verified_elems:
+            if "Verified Purchase" in elem.get_text():
+                verified_purchase = True
+                break
+
+        if review_text and rating > 0:
+            return {
+                "review_text": review_text,
+                "title": review_title,
+                "rating": rating,
+                "review_date": review_date,
+                "helpful_votes": helpful_votes,
+                "product_name": product_name,
+                "author_name": reviewer_name,
+                "verified_purchase": verified_purchase
+            }
+
+        return None
+
+    except Exception as e:
+        print(f"Error parsing review container: {e}")
+        return None
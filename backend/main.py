@@ -4,6 +4,7 @@ from core.config import get_settings
 from api.endpoints import products
 from api.endpoints import reviews
 from api.endpoints import analysis
+from api.endpoints import metrics
 import os
 
 
@@ -57,6 +58,12 @@ def create_application() -> FastAPI:
         tags=["analysis"]
     )
     
+    app.include_router(
+        metrics.router,
+        prefix=f"{settings.API_V1_STR}/metrics",
+        tags=["metrics"]
+    )
+    
     return app
 
 
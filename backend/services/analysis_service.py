@@ -1,5 +1,5 @@
 import asyncio
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import json
 import hashlib
 from datetime import datetime
@@ -8,9 +8,13 @@ from services.gemini import GeminiModel
 from core.config import get_settings
 
 class AnalysisService:
-    def __init__(self):
-        self.pinecone = PineconeService()
-        self.gemini = GeminiModel()
+    def __init__(
+            self,
+            pinecone_service: Optional[PineconeService] = None,
+            gemini_model: Optional[GeminiModel] = None
+        ):
+        self.pinecone = pinecone_service or PineconeService()
+        self.gemini = gemini_model or GeminiModel()
         self.settings = get_settings()
     
     async def analyze_reviews(self, selected_products: Dict[str, Dict]) -> Dict[str, Any]:
@@ -190,11 +194,7 @@ class AnalysisService:
     
     async def _get_comparison_reviews(self, comparison_id: str) -> List[Dict]:
         try:
-            reviews = await self.pinecone.search_reviews_by_comparison(
-                comparison_id=comparison_id,
-                question="product review analysis",
-                top_k=1000
-            )
+            reviews = await self.pinecone.fetch_all_reviews(comparison_id)
             return reviews
         except Exception as e:
             print(f"Error getting comparison reviews: {e}")
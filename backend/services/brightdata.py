@@ -1,65 +1,189 @@
 from core.config import get_settings
 from utils.retry import with_retry
-import httpx
-from bs4 import BeautifulSoup
-import re
-from typing import Dict, List
+from services.http_transport import HttpTransport, get_http_transport
+from services.page_cache import PageCache, get_page_cache
+from services.kv_cache import KVCache, get_kv_cache
+from utils.single_flight import SingleFlight
+from services.parse_pool import get_parse_pool
+from extractors import serp
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
 from urllib.parse import quote_plus
 import json
 import asyncio
 import aiohttp
+import time
+
+
+@dataclass
+class SnapshotDownload:
+    rows: int = 0
+    bytes_read: int = 0
+    bytes_skipped: Optional[int] = None
+    parse_seconds: float = 0.0
+    cutoff: bool = False
+    status_only: bool = False
+
 
 class BrightDataClient:
 
-    def __init__(self):
+    API_BASE_URL = 'https://api.brightdata.com'
+
+    def __init__(
+        self,
+        transport: Optional[HttpTransport] = None,
+        page_cache: Optional[PageCache] = None,
+        serp_cache: Optional[KVCache] = None
+    ):
         settings = get_settings()
         self.api_key = settings.BRIGHT_DATA_API_KEY
         self.serp_zone = settings.BRIGHT_DATA_SERP_ZONE
         self.webunlocker_zone = settings.BRIGHT_DATA_WEBUNLOCKER_ZONE   
         
-        self.session = None
-    
-    async def _ensure_session(self):
-        if self.session is None or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        # the shared transport outlives every client and is closed at app shutdown
+        shared_transport = get_http_transport()
+        self.transport = transport or shared_transport
+        self._owns_transport = self.transport is not shared_transport
+        self.request_flight = SingleFlight()
+        self.page_cache = page_cache or get_page_cache()
+        self.serp_cache = serp_cache or (get_kv_cache() if settings.SERP_CACHE_ENABLED else None)
+        self.serp_cache_ttl_seconds = settings.SERP_CACHE_TTL_SECONDS
+        self.serp_cache_hits = 0
+        self.serp_cache_misses = 0
     
     async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
+        if self._owns_transport:
+            await self.transport.close()
      
     async def __aenter__(self):
-        await self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
+        
+    def _auth_headers(self) -> Dict[str, str]:
+        return {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
+    
+    # identical concurrent requests share one paid call
+    async def _make_request(self, url: str, zone: str, format: str = 'raw') -> str:
+        return await self.request_flight.do(
+            (url, zone, format),
+            lambda: self._send_request(url, zone, format)
+        )
     
     # making request
     @with_retry(max_retries=2)
-    async def _make_request(self, url: str, zone: str, format: str = 'raw') -> str:
-        await self._ensure_session()
+    async def _send_request(self, url: str, zone: str, format: str = 'raw') -> str:
+        session = await self.transport.session()
+        async with session.post(
+            f'{self.API_BASE_URL}/request',
+            headers=self._auth_headers(),
+            json={
+                'zone': zone,
+                'url': url,
+                'format': format
+            }
+        ) as response:
+            if response.status != 200:
+                response.raise_for_status()
+            
+            return await response.text()
+        
+    # triggering a dataset collection, returns the snapshot id
+    async def trigger_dataset(
+        self,
+        dataset_id: str,
+        inputs: List[Dict],
+        notify_url: Optional[str] = None,
+        notify_secret: Optional[str] = None
+    ) -> Optional[str]:
+        params = {
+            'dataset_id': dataset_id,
+            'include_errors': 'true'
+        }
+        if notify_url:
+            params['notify'] = notify_url
+            if notify_secret:
+                params['auth_header'] = notify_secret
+        
+        session = await self.transport.session()
+        async with session.post(
+            f'{self.API_BASE_URL}/datasets/v3/trigger',
+            headers=self._auth_headers(),
+            json=inputs,
+            params=params,
+            timeout=aiohttp.ClientTimeout(total=120)
+        ) as response:
+            trigger_result = await response.json(content_type=None)
+            return trigger_result.get('snapshot_id')
+    
+    # streaming a snapshot as ndjson, returns None while it is still being collected
+    async def stream_snapshot(self, snapshot_id: str, on_row: Callable[[Dict], bool]) -> Optional[SnapshotDownload]:
+        session = await self.transport.session()
+        async with session.get(
+            f'{self.API_BASE_URL}/datasets/v3/snapshot/{snapshot_id}',
+            headers={'Authorization': f'Bearer {self.api_key}'},
+            params={'format': 'ndjson'},
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+        ) as response:
+            if response.status != 200:
+                return None
+            
+            download = SnapshotDownload()
+            buffer = b''
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                download.bytes_read += len(chunk)
+                lines = (buffer + chunk).split(b'\n')
+                buffer = lines.pop()
+                
+                if self._parse_ndjson_lines(lines, on_row, download):
+                    break
+            else:
+                if buffer.strip():
+                    self._parse_ndjson_lines([buffer], on_row, download)
+            
+            if download.status_only:
+                return None
+            
+            if download.cutoff:
+                # stop here instead of draining the rest of the body, chunked bodies leave bytes_skipped unknown
+                if response.content_length is not None:
+                    download.bytes_skipped = max(response.content_length - download.bytes_read, 0)
+                response.close()
+            else:
+                download.bytes_skipped = 0
+            
+            return download
+    
+    def _parse_ndjson_lines(self, lines: List[bytes], on_row: Callable[[Dict], bool], download: SnapshotDownload) -> bool:
+        started = time.perf_counter()
         try:
-            async with self.session.post(
-                'https://api.brightdata.com/request',
-                headers={
-                    'Authorization': f'Bearer {self.api_key}',
-                    'Content-Type': 'application/json'
-                },
-                json={
-                    'zone': zone,
-                    'url': url,
-                    'format': format
-                }
-            ) as response:
-                if response.status != 200:
-                    text = await response.text()
-                    response.raise_for_status()
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"JSON decode error: {e}")
+                    continue
+                if not isinstance(row, dict):
+                    continue
                 
-                return await response.text()
-        except Exception as e:
-            await self.close()
-            raise
+                # a not-ready snapshot answers with a single status object
+                if download.rows == 0 and row.keys() <= {'status', 'message'}:
+                    download.status_only = True
+                    return True
+                
+                download.rows += 1
+                if on_row(row):
+                    download.cutoff = True
+                    return True
+            return False
+        finally:
+            download.parse_seconds += time.perf_counter() - started
 
     # discovering urls
     async def discover(self, product: str, max_per_store: int = 5) -> Dict[str, List[str]]:
@@ -75,9 +199,14 @@ class BrightDataClient:
         }
 
         async def search_store_with_timeout(store_name, query):
+            cached_urls = await self._cached_store_urls(store_name, product, max_per_store)
+            if cached_urls is not None:
+                return (store_name, cached_urls)
             try:
                 async with asyncio.timeout(45):
-                    return await self._search_store(store_name, query, max_per_store, patterns)
+                    result = await self._search_store(store_name, query, max_per_store, patterns)
+                await self._cache_store_urls(store_name, product, max_per_store, result[1])
+                return result
             except asyncio.TimeoutError:
                 print(f"Search timeout for {store_name}")
                 return (store_name, [])
@@ -127,32 +256,75 @@ class BrightDataClient:
                 print(f"No HTML content received for {store_name}")
                 return (store_name, [])
 
-            soup = BeautifulSoup(html_content, "html.parser")
-            all_links = [
-                a.get('href') for a in soup.select('a[href]')
-                if a.get('href') and a.get('href').startswith('http')
-            ]
-
-            product_urls = []
-            pattern = patterns.get(store_name, '')
-            
-            for url in all_links:
-                if pattern and re.search(pattern, url):
-                    clean_url = url.split('&utm_')[0].split('?utm_')[0]
-                    if clean_url not in product_urls:
-                        product_urls.append(clean_url)
-                        
-                    if len(product_urls) >= max_per_store:
-                        break
+            product_urls = await get_parse_pool().run(
+                serp.parse_product_urls,
+                html_content,
+                patterns.get(store_name, ''),
+                max_per_store
+            )
 
             print(f"Found {len(product_urls)} URLs for {store_name}")
-            return (store_name, product_urls[:max_per_store])
+            return (store_name, product_urls)
         
         except Exception as e:
             print(f"Error discovering {store_name} products: {str(e)}")
             return (store_name, [])
     
-    async def get_product_page(self, url: str) -> str:
+    # serp urls are cached per store and query as soon as each search returns
+    def _serp_cache_key(self, store_name: str, product: str) -> str:
+        normalized = " ".join(sorted(product.lower().split()))
+        return f"serp:{store_name}:{normalized}"
+    
+    async def _cached_store_urls(self, store_name: str, product: str, max_per_store: int) -> Optional[List[str]]:
+        if self.serp_cache is None:
+            return None
+        try:
+            cached = await asyncio.to_thread(self.serp_cache.get, self._serp_cache_key(store_name, product))
+        except Exception as e:
+            print(f"SERP cache lookup failed: {e}")
+            return None
+        
+        # a cached list cut at a smaller max may be missing urls
+        if cached and (cached["max_per_store"] >= max_per_store or len(cached["urls"]) < cached["max_per_store"]):
+            self.serp_cache_hits += 1
+            print(f"Using cached search results for {store_name}")
+            return cached["urls"][:max_per_store]
+        
+        self.serp_cache_misses += 1
+        return None
+    
+    async def _cache_store_urls(self, store_name: str, product: str, max_per_store: int, urls: List[str]):
+        if self.serp_cache is None or not urls:
+            return
+        try:
+            await asyncio.to_thread(
+                self.serp_cache.set,
+                self._serp_cache_key(store_name, product),
+                {"urls": urls, "max_per_store": max_per_store, "cached_at": time.time()},
+                ttl_seconds=self.serp_cache_ttl_seconds
+            )
+        except Exception as e:
+            print(f"SERP cache write failed: {e}")
+    
+    def serp_cache_stats(self) -> Dict[str, float]:
+        lookups = self.serp_cache_hits + self.serp_cache_misses
+        return {
+            "enabled": self.serp_cache is not None,
+            "hits": self.serp_cache_hits,
+            "misses": self.serp_cache_misses,
+            "hit_rate": round(self.serp_cache_hits / lookups, 3) if lookups else 0.0,
+        }
+    
+    # only 2xx pages that pass the caller's sanity check are cached, so block pages and errors are refetched
+    async def get_product_page(self, url: str, is_valid: Optional[Callable[[str], bool]] = None) -> str:
+        if self.page_cache is not None:
+            try:
+                cached_html = await asyncio.to_thread(self.page_cache.get, self.webunlocker_zone, url)
+                if cached_html:
+                    return cached_html
+            except Exception as e:
+                print(f"Page cache lookup failed: {e}")
+        
         try:
             async with asyncio.timeout(25):
                 response_text = await self._make_request(
@@ -169,6 +341,17 @@ class BrightDataClient:
             
             if not html_content:
                 raise Exception("No HTML content in response body")
+            
+            status_code = int(response_data.get('status_code') or 200)
+            cacheable = 200 <= status_code < 300 and (is_valid is None or is_valid(html_content))
+            if not cacheable:
+                print(f"Not caching {url}, status {status_code}")
+            
+            if self.page_cache is not None and cacheable:
+                try:
+                    await asyncio.to_thread(self.page_cache.set, self.webunlocker_zone, url, html_content)
+                except Exception as e:
+                    print(f"Page cache write failed: {e}")
                 
             return html_content
             
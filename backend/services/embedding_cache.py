@@ -0,0 +1,162 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+import numpy as np
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: an in-memory LRU in front of a size-bounded SQLite store.
+
+    Entries are content-addressed by model name plus a hash of the normalized text,
+    so identical review texts and repeated questions are only embedded once.
+    """
+
+    def __init__(self, path: str, memory_items: int = 10000, disk_max_items: int = 200000):
+        self.path = path
+        self.memory_items = max(0, memory_items)
+        self.disk_max_items = max(1, disk_max_items)
+
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)")
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @classmethod
+    def make_key(cls, model_name: str, text: str) -> str:
+        digest = hashlib.sha256(cls.normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model_name}:{digest}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        disk_keys = []
+
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                else:
+                    disk_keys.append(key)
+
+            if disk_keys:
+                for key, vector in self._read_disk(disk_keys).items():
+                    found[key] = vector
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]):
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+
+            rows = [
+                (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                for key, vector in items.items()
+            ]
+            self._conn.execute("BEGIN")
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                rows
+            )
+            self._disk_count += self._conn.total_changes - before
+            self._evict_disk()
+            self._conn.execute("COMMIT")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_items": len(self._memory),
+            "disk_items": self._disk_count,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _remember(self, key: str, vector: List[float]):
+        if self.memory_items == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        # sqlite caps the number of bound parameters per statement
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                chunk
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                [(now, key) for key in found]
+            )
+        return found
+
+    def _evict_disk(self):
+        overflow = self._disk_count - self.disk_max_items
+        if overflow <= 0:
+            return
+        # evicting a little extra so we don't run this on every insert
+        evict = overflow + self.disk_max_items // 20
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (evict,)
+        )
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+def open_embedding_cache(path: str, memory_items: int, disk_max_items: int) -> Optional[EmbeddingCache]:
+    try:
+        return EmbeddingCache(path, memory_items=memory_items, disk_max_items=disk_max_items)
+    except Exception as e:
+        print(f"Error opening embedding cache at {path}: {e}")
+        return None
@@ -0,0 +1,205 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional
+import asyncio
+import hashlib
+import os
+import threading
+from core.config import get_settings
+from services.embedding_cache import EmbeddingCache, open_embedding_cache
+
+
+def hash_embedding(text: str, dimension: int) -> List[float]:
+    hash_bytes = hashlib.md5(text.encode()).digest()
+    embedding = []
+    for i in range(0, len(hash_bytes), 4):
+        chunk = hash_bytes[i:i+4]
+        if len(chunk) == 4:
+            embedding.append(int.from_bytes(chunk, 'big') / (2**32))
+
+    while len(embedding) < dimension:
+        embedding.extend(embedding[:min(len(embedding), dimension - len(embedding))])
+
+    return embedding[:dimension]
+
+
+class EmbeddingBackend(ABC):
+    """Embeds texts on a worker pool so model calls never block the event loop"""
+
+    def __init__(self, model_name: str, dimension: int, batch_size: int, max_workers: int):
+        self.model_name = model_name
+        self.dimension = dimension
+        self.batch_size = max(1, batch_size)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="embedding")
+        self.cache: Optional[EmbeddingCache] = None
+
+    @abstractmethod
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Blocking call that embeds one batch, runs inside the worker pool"""
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        keys = [EmbeddingCache.make_key(self.model_name, text) for text in texts]
+        cached = {}
+        if self.cache:
+            cached = await asyncio.to_thread(self.cache.get_many, list(dict.fromkeys(keys)))
+
+        # embedding each distinct uncached text once
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in pending:
+                pending[key] = text
+
+        computed = await self._compute(list(pending.keys()), list(pending.values()))
+        cached.update(computed)
+
+        return [cached.get(key) or hash_embedding(text, self.dimension) for key, text in zip(keys, texts)]
+
+    async def _compute(self, keys: List[str], texts: List[str]) -> dict:
+        if not texts:
+            return {}
+
+        loop = asyncio.get_running_loop()
+        batches = [
+            (keys[i:i + self.batch_size], texts[i:i + self.batch_size])
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self.executor, self._embed_batch, batch_texts) for _, batch_texts in batches),
+            return_exceptions=True
+        )
+
+        computed = {}
+        for (batch_keys, _), result in zip(batches, results):
+            if isinstance(result, Exception):
+                # failed batches fall back to hash embeddings and are never cached
+                print(f"Error generating embeddings with {self.model_name}: {result}")
+                continue
+            for key, embedding in zip(batch_keys, result):
+                computed[key] = self._fit_dimension(embedding)
+
+        if self.cache and computed:
+            await asyncio.to_thread(self.cache.put_many, computed)
+
+        return computed
+
+    async def embed(self, text: str) -> List[float]:
+        embeddings = await self.embed_many([text])
+        return embeddings[0]
+
+    def _fit_dimension(self, embedding) -> List[float]:
+        if hasattr(embedding, 'tolist'):
+            embedding = embedding.tolist()
+        else:
+            embedding = list(embedding)
+
+        # handling 2d array
+        if embedding and isinstance(embedding[0], list):
+            embedding = embedding[0]
+
+        if len(embedding) > self.dimension:
+            embedding = embedding[:self.dimension]
+        elif len(embedding) < self.dimension:
+            embedding.extend([0.0] * (self.dimension - len(embedding)))
+
+        return embedding
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.cache:
+            self.cache.close()
+
+
+class HuggingFaceEmbeddingBackend(EmbeddingBackend):
+    """Remote HuggingFace Inference API, one request per text"""
+
+    def __init__(self, model_name: str, dimension: int, api_key: str, max_workers: int):
+        # the inference api embeds one text per request, so batches of one
+        # let the worker pool run the requests concurrently
+        super().__init__(model_name, dimension, batch_size=1, max_workers=max_workers)
+        try:
+            from huggingface_hub import InferenceClient
+            self.hf_client = InferenceClient(api_key=api_key)
+        except Exception as e:
+            print(f'Error initializing HuggingFace client: {e}')
+            self.hf_client = None
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        if not self.hf_client:
+            raise RuntimeError("HuggingFace client is not initialized")
+
+        return [
+            self.hf_client.feature_extraction(text, model=self.model_name)
+            for text in texts
+        ]
+
+
+class LocalEmbeddingBackend(EmbeddingBackend):
+    """In-process sentence-transformers model, one forward pass per batch"""
+
+    def __init__(self, model_name: str, dimension: int, batch_size: int, max_workers: int, use_onnx: bool = False):
+        super().__init__(model_name, dimension, batch_size=batch_size, max_workers=max_workers)
+        from sentence_transformers import SentenceTransformer
+
+        self._model_cls = SentenceTransformer
+        self.use_onnx = use_onnx
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    def _get_model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    kwargs = {"device": "cpu"}
+                    if self.use_onnx:
+                        kwargs["backend"] = "onnx"
+                    self._model = self._model_cls(self.model_name, **kwargs)
+        return self._model
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        model = self._get_model()
+        return model.encode(
+            texts,
+            batch_size=len(texts),
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+
+
+@lru_cache
+def get_embedding_backend() -> EmbeddingBackend:
+    settings = get_settings()
+    backend = _create_embedding_backend(settings)
+
+    if settings.EMBEDDING_CACHE_ENABLED:
+        backend.cache = open_embedding_cache(
+            os.path.join(settings.LOCAL_CACHE_DIR, "embeddings.sqlite3"),
+            memory_items=settings.EMBEDDING_CACHE_MEMORY_ITEMS,
+            disk_max_items=settings.EMBEDDING_CACHE_DISK_MAX_ITEMS
+        )
+
+    return backend
+
+
+def _create_embedding_backend(settings) -> EmbeddingBackend:
+    if settings.EMBEDDING_BACKEND == "local":
+        try:
+            return LocalEmbeddingBackend(
+                model_name=settings.EMBEDDING_MODEL,
+                dimension=settings.EMBEDDING_DIMENSION,
+                batch_size=settings.EMBEDDING_BATCH_SIZE,
+                max_workers=settings.EMBEDDING_MAX_WORKERS,
+                use_onnx=settings.EMBEDDING_USE_ONNX
+            )
+        except ImportError as e:
+            print(f"Local embedding backend unavailable, falling back to HuggingFace: {e}")
+
+    return HuggingFaceEmbeddingBackend(
+        model_name=settings.EMBEDDING_MODEL,
+        dimension=settings.EMBEDDING_DIMENSION,
+        api_key=settings.HUGGINGFACE_API_KEY,
+        max_workers=settings.EMBEDDING_MAX_WORKERS
+    )
@@ -2,12 +2,16 @@ import google.generativeai as genai
 import json 
 import asyncio
 from core.config import get_settings
+from services.llm_cache import CachedResponse, get_response_cache
 
 class GeminiModel: 
     
     def __init__(self, model_name="gemini-2.0-flash"):
         settings = get_settings()
         genai.configure(api_key=settings.GEMINI_API_KEY)
+        self.timeout_seconds = settings.GEMINI_TIMEOUT_SECONDS
+        self.model_name = model_name
+        self.cache = get_response_cache() if settings.LLM_CACHE_ENABLED else None
         
         self.generation_config = {
             'response_mime_type': 'application/json',
@@ -38,37 +42,44 @@ class GeminiModel:
         prompt += f"Return JSON array with exactly {len(products)} objects, one for each product in order:"
         
         try:
-            async with asyncio.timeout(25):
-                response = self.model.generate_content(prompt)
-                result = json.loads(response.text)
-                
-                if len(result) == len(products):
-                    return result
+            response = await self.generate_content(prompt)
+            result = json.loads(response.text)
+            
+            if len(result) == len(products):
+                return result
+            else:
+                if len(result) < len(products):
+                    result.extend([{}] * (len(products) - len(result)))
                 else:
-                    if len(result) < len(products):
-                        result.extend([{}] * (len(products) - len(result)))
-                    else:
-                        result = result[:len(products)]
-                    return result
+                    result = result[:len(products)]
+                return result
                     
-        except asyncio.TimeoutError:
-            return [{} for _ in products]
         except json.JSONDecodeError as e:
             return [{} for _ in products]
         except Exception as e:
             return [{} for _ in products]
 
     async def generate_content(self, prompt: str) -> any:
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_key(self.model_name, self.generation_config, prompt)
+            cached_text = self.cache.get(cache_key)
+            if cached_text is not None:
+                return CachedResponse(cached_text)
+
         try:            
-            async with asyncio.timeout(25):
-                response = self.model.generate_content(prompt)
+            async with asyncio.timeout(self.timeout_seconds):
+                response = await self.model.generate_content_async(prompt)
                 if not response or not hasattr(response, 'text'):
                     raise Exception("Invalid response from Gemini - no text attribute")
                 if not response.text or response.text.strip() == "":
                     raise Exception("Empty response from Gemini")
-                return response
+                
+            if cache_key:
+                self.cache.set(cache_key, response.text)
+            return response
                 
         except asyncio.TimeoutError:
-            raise Exception("Gemini API timeout after 20 seconds")
+            raise Exception(f"Gemini API timeout after {self.timeout_seconds} seconds")
         except Exception as e:
             raise Exception(f"Gemini API error: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,68 @@
+from functools import lru_cache
+from typing import Optional
+import asyncio
+import aiohttp
+from core.config import get_settings
+
+
+class HttpTransport:
+    """One pooled aiohttp session shared by every outbound Bright Data call.
+
+    The connector keeps connections alive between requests, caps connections
+    overall and per host, and caches DNS lookups. The session is created
+    lazily on the running loop and recreated if it was closed, so an error in
+    one call never forces the next one to reconnect.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 60.0,
+        timeout_seconds: float = 30.0
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout_seconds = timeout_seconds
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+
+    async def session(self) -> aiohttp.ClientSession:
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    keepalive_timeout=self.keepalive_timeout,
+                    enable_cleanup_closed=True
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout_seconds)
+                )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+@lru_cache
+def get_http_transport() -> HttpTransport:
+    settings = get_settings()
+    return HttpTransport(
+        limit=settings.HTTP_POOL_LIMIT,
+        limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+        dns_cache_ttl=settings.HTTP_DNS_CACHE_TTL_SECONDS,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT_SECONDS,
+        timeout_seconds=settings.HTTP_TIMEOUT_SECONDS
+    )
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import time
+
+
+@dataclass
+class IngestionStats:
+    reviews: int = 0
+    embedded: int = 0
+    upserted: int = 0
+    embed_batches: int = 0
+    upsert_batches: int = 0
+    failed_upserts: int = 0
+    embed_seconds: float = 0.0
+    upsert_seconds: float = 0.0
+    queue_wait_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        for key in ("embed_seconds", "upsert_seconds", "queue_wait_seconds", "total_seconds"):
+            stats[key] = round(stats[key], 3)
+        return stats
+
+
+class ReviewIngestionPipeline:
+    """Streams reviews through embed -> upsert with a bounded queue between the stages.
+
+    The embedding stage produces vector batches while upsert workers drain the
+    queue, so storage overlaps with embedding. When the workers fall behind the
+    queue fills up and the embedding stage waits (backpressure).
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[List[str]], Awaitable[List[List[float]]]],
+        upsert: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+        embed_batch_size: int = 64,
+        upsert_batch_size: int = 100,
+        queue_size: int = 4,
+        upsert_workers: int = 2
+    ):
+        self.embed = embed
+        self.upsert = upsert
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.upsert_batch_size = max(1, upsert_batch_size)
+        self.queue_size = max(1, queue_size)
+        self.upsert_workers = max(1, upsert_workers)
+
+    async def run(
+        self,
+        items: List[Any],
+        to_text: Callable[[Any], str],
+        to_vector: Callable[[Any, List[float]], Dict[str, Any]],
+        on_progress: Optional[Callable[[IngestionStats], Awaitable[None]]] = None
+    ) -> IngestionStats:
+        stats = IngestionStats(reviews=len(items))
+        started = time.perf_counter()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def produce():
+            pending = []
+            try:
+                for i in range(0, len(items), self.embed_batch_size):
+                    batch = items[i:i + self.embed_batch_size]
+
+                    embed_started = time.perf_counter()
+                    embeddings = await self.embed([to_text(item) for item in batch])
+                    stats.embed_seconds += time.perf_counter() - embed_started
+                    stats.embed_batches += 1
+                    stats.embedded += len(batch)
+
+                    pending.extend(to_vector(item, embedding) for item, embedding in zip(batch, embeddings))
+                    while len(pending) >= self.upsert_batch_size:
+                        await self._enqueue(queue, pending[:self.upsert_batch_size], stats)
+                        pending = pending[self.upsert_batch_size:]
+
+                if pending:
+                    await self._enqueue(queue, pending, stats)
+            finally:
+                for _ in range(self.upsert_workers):
+                    await queue.put(None)
+
+        async def consume():
+            while True:
+                vectors = await queue.get()
+                if vectors is None:
+                    return
+
+                upsert_started = time.perf_counter()
+                try:
+                    await self.upsert(vectors)
+                    stats.upserted += len(vectors)
+                except Exception as e:
+                    print(f"Error upserting batch of {len(vectors)} vectors: {e}")
+                    stats.failed_upserts += 1
+                finally:
+                    stats.upsert_seconds += time.perf_counter() - upsert_started
+                    stats.upsert_batches += 1
+                if on_progress is not None:
+                    await on_progress(stats)
+
+        workers = [asyncio.create_task(consume()) for _ in range(self.upsert_workers)]
+        try:
+            await produce()
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            raise
+
+        stats.total_seconds = time.perf_counter() - started
+        return stats
+
+    async def _enqueue(self, queue: asyncio.Queue, vectors: List[Dict[str, Any]], stats: IngestionStats):
+        wait_started = time.perf_counter()
+        await queue.put(vectors)
+        stats.queue_wait_seconds += time.perf_counter() - wait_started
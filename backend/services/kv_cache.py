@@ -0,0 +1,91 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+from core.config import get_settings
+
+
+class KVCache(ABC):
+    """Key/value cache with native per-entry TTL"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        pass
+
+
+class SQLiteKVCache(KVCache):
+    """Local KV cache backed by a single SQLite table, values stored as JSON"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_kv_expires_at ON kv(expires_at)")
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM kv WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at <= time.time():
+                self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+                return None
+
+            return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl_seconds)
+            )
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM kv WHERE expires_at <= ?", (time.time(),))
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache
+def get_kv_cache() -> KVCache:
+    settings = get_settings()
+
+    if settings.KV_CACHE_BACKEND != "sqlite":
+        raise ValueError(f"Unsupported KV cache backend: {settings.KV_CACHE_BACKEND}")
+
+    return SQLiteKVCache(os.path.join(settings.LOCAL_CACHE_DIR, "kv.sqlite3"))
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import threading
+import time
+from core.config import get_settings
+
+
+class CachedResponse:
+    """Stands in for a Gemini response when the text comes from the cache"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class ResponseCache:
+    """Bounded in-process LRU of LLM response texts with a per-entry TTL"""
+
+    def __init__(self, max_items: int = 512, ttl_seconds: int = 3600):
+        self.max_items = max(1, max_items)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(model_name: str, generation_config: Dict[str, Any], prompt: str) -> str:
+        config = json.dumps(generation_config, sort_keys=True, default=str)
+        digest = hashlib.sha256(f"{model_name}\n{config}\n{prompt}".encode("utf-8")).hexdigest()
+        return digest
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, text = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def set(self, key: str, text: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "items": len(self._entries),
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    settings = get_settings()
+    return ResponseCache(
+        max_items=settings.LLM_CACHE_MAX_ITEMS,
+        ttl_seconds=settings.LLM_CACHE_TTL_SECONDS
+    )
@@ -0,0 +1,209 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from core.config import get_settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class PageCache:
+    """Compressed on-disk cache of scraped HTML pages.
+
+    Bodies are stored as zstd (or gzip when zstandard is not installed) files
+    under the cache directory and indexed in SQLite by zone and url. Entries
+    expire after a per-zone TTL and the least recently used ones are evicted
+    once the compressed bodies exceed the size cap. Expired bodies are also
+    purged when the cache opens and at most every `PURGE_INTERVAL_SECONDS`
+    on writes, so an idle cache does not keep stale pages on disk.
+    """
+
+    PURGE_INTERVAL_SECONDS = 600
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        default_ttl_seconds: int = 21600,
+        zone_ttl_seconds: Optional[Dict[str, int]] = None
+    ):
+        self.directory = directory
+        self.max_bytes = max(1, max_bytes)
+        self.default_ttl_seconds = default_ttl_seconds
+        self.zone_ttl_seconds = zone_ttl_seconds or {}
+        self.codec = "zstd" if zstandard is not None else "gzip"
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT PRIMARY KEY, zone TEXT NOT NULL, url TEXT NOT NULL, codec TEXT NOT NULL, "
+            "size INTEGER NOT NULL, raw_size INTEGER NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages(last_access)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+        self._next_purge_at = 0.0
+        self.purge_expired()
+
+    @staticmethod
+    def make_key(zone: str, url: str) -> str:
+        return hashlib.sha256(f"{zone}\n{url}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, codec: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.html.{'zst' if codec == 'zstd' else 'gz'}")
+
+    def ttl_for(self, zone: str) -> int:
+        return self.zone_ttl_seconds.get(zone, self.default_ttl_seconds)
+
+    def _compress(self, body: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(body)
+        return gzip.compress(body, compresslevel=6)
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise ValueError("zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def get(self, zone: str, url: str) -> Optional[str]:
+        key = self.make_key(zone, url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT codec, expires_at FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            codec, expires_at = row
+            if expires_at <= now:
+                self._remove(key, codec)
+                self.misses += 1
+                return None
+
+            try:
+                with open(self._path(key, codec), "rb") as f:
+                    body = self._decompress(f.read(), codec)
+            except (OSError, ValueError) as e:
+                print(f"Error reading cached page {url}: {e}")
+                self._remove(key, codec)
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE pages SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return body.decode("utf-8")
+
+    def set(self, zone: str, url: str, html: str):
+        key = self.make_key(zone, url)
+        raw = html.encode("utf-8")
+        data = self._compress(raw)
+        path = self._path(key, self.codec)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute("SELECT codec FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._remove(key, row[0])
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self._conn.execute(
+                "INSERT INTO pages (key, zone, url, codec, size, raw_size, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, zone, url, self.codec, len(data), len(raw), now + self.ttl_for(zone), now)
+            )
+            self._total_bytes += len(data)
+            if now >= self._next_purge_at:
+                self._purge_expired(now)
+            self._evict()
+
+    def _remove(self, key: str, codec: str):
+        row = self._conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return
+        self._conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+        self._total_bytes -= row[0]
+        try:
+            os.remove(self._path(key, codec))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        # expired entries go first, then least recently used
+        self._purge_expired(time.time())
+
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute("SELECT key, codec FROM pages ORDER BY last_access LIMIT 32").fetchall()
+            if not rows:
+                break
+            for key, codec in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._remove(key, codec)
+                self.evictions += 1
+
+    def _purge_expired(self, now: float) -> int:
+        rows = self._conn.execute("SELECT key, codec FROM pages WHERE expires_at <= ?", (now,)).fetchall()
+        for key, codec in rows:
+            self._remove(key, codec)
+        self.expired += len(rows)
+        self._next_purge_at = now + self.PURGE_INTERVAL_SECONDS
+        return len(rows)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge_expired(time.time())
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            items, raw_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(raw_size), 0) FROM pages").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "items": items,
+            "bytes": self._total_bytes,
+            "raw_bytes": raw_bytes,
+            "codec": self.codec,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+@lru_cache
+def get_page_cache() -> Optional[PageCache]:
+    settings = get_settings()
+    if not settings.PAGE_CACHE_ENABLED:
+        return None
+    return PageCache(
+        os.path.join(settings.LOCAL_CACHE_DIR, "pages"),
+        max_bytes=settings.PAGE_CACHE_MAX_BYTES,
+        default_ttl_seconds=settings.PAGE_CACHE_TTL_SECONDS,
+        zone_ttl_seconds=settings.PAGE_CACHE_ZONE_TTL_SECONDS
+    )
@@ -0,0 +1,100 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+import asyncio
+import multiprocessing
+import threading
+import time
+from core.config import get_settings
+
+T = TypeVar('T')
+
+
+class ParsePool:
+    """Runs CPU-bound HTML parsing in worker processes.
+
+    Parse functions must be module-level so they can be pickled; they take
+    the raw page text and return plain dicts or lists. With zero workers the
+    functions run on a thread instead, which still keeps the event loop free.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max(0, max_workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.parse_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn avoids forking a process that already runs threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+
+        try:
+            if self.max_workers == 0:
+                result, elapsed = await asyncio.to_thread(_run_timed, fn, *args)
+            else:
+                result, elapsed = await self._run_in_process(fn, *args)
+            self.parse_seconds += elapsed
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+    async def _run_in_process(self, fn: Callable[..., T], *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), partial(_run_timed, fn, *args))
+        except BrokenProcessPool:
+            # a crashed worker takes the pool down, start fresh next time
+            self._reset_executor()
+            raise
+
+    def close(self):
+        self._reset_executor()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "queue_depth": max(self.pending - max(self.max_workers, 1), 0),
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_parse_ms": round(self.parse_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+
+def _run_timed(fn: Callable[..., T], *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+@lru_cache
+def get_parse_pool() -> ParsePool:
+    settings = get_settings()
+    return ParsePool(max_workers=settings.PARSE_POOL_WORKERS)
@@ -1,106 +1,63 @@
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Set
 import json
+import re
 from uuid import uuid4
-from pinecone import Pinecone, ServerlessSpec
 from core.config import get_settings
 from utils.retry import with_retry
-from huggingface_hub import InferenceClient
-import hashlib
+from services.embeddings import get_embedding_backend
+from services.vector_client import get_vector_client
+from services.kv_cache import get_kv_cache
+from services.ingestion import IngestionStats, ReviewIngestionPipeline
+from services.seen_reviews import get_seen_review_set, make_review_id
 import asyncio
 
+
+def _query_tokens(text: str) -> Set[str]:
+    # "WH-1000XM5" and "wh1000xm5" become the same token
+    return set(re.findall(r"[a-z0-9]+", (text or "").lower().replace("-", "")))
+
+
+def _model_tokens(tokens: Set[str]) -> Set[str]:
+    return {token for token in tokens if any(char.isdigit() for char in token)}
+
+
 class PineconeService: 
     def __init__(self):
         self.settings = get_settings()
-        self.pc = Pinecone(api_key=self.settings.PINECONE_API_KEY)
-        self.embedding_dimension = 384
+        self.vector_client = get_vector_client()
+        self.embedding_dimension = self.settings.EMBEDDING_DIMENSION
         self._indexes_initialized = False
+        self.embedder = get_embedding_backend()
+        self.kv_cache = get_kv_cache()
+        self.seen_reviews = get_seen_review_set()
         
-        try:
-            self.hf_client = InferenceClient(api_key=self.settings.HUGGINGFACE_API_KEY)
-        except Exception as e:
-            print(f'Error initializing HuggingFace client: {e}')
-            self.hf_client = None
+        self.discovery_lookups = 0
+        self.discovery_exact_hits = 0
+        self.discovery_semantic_hits = 0
+        self.discovery_semantic_rejected = 0
         
     async def _ensure_indexes_exist(self):
         if self._indexes_initialized:
             return
         
-        existing_indexes = self.pc.list_indexes().names()
-        
         # discovery cache index
-        if self.settings.PINECONE_DISCOVERY_INDEX not in existing_indexes:
-            self.pc.create_index(
-                name=self.settings.PINECONE_DISCOVERY_INDEX,
-                dimension=self.embedding_dimension,
-                metric="cosine",
-                spec=ServerlessSpec(
-                    cloud="aws",
-                    region=self.settings.PINECONE_ENVIRONMENT
-                )
-            )
+        await self.vector_client.ensure_index(self.settings.PINECONE_DISCOVERY_INDEX, self.embedding_dimension)
             
         # reviews index 
-        if self.settings.PINECONE_REVIEWS_INDEX not in existing_indexes:
-            self.pc.create_index(
-                name=self.settings.PINECONE_REVIEWS_INDEX,
-                dimension=self.embedding_dimension,
-                metric="cosine",
-                spec=ServerlessSpec(
-                    cloud="aws",
-                    region=self.settings.PINECONE_ENVIRONMENT
-                )
-            )
+        await self.vector_client.ensure_index(self.settings.PINECONE_REVIEWS_INDEX, self.embedding_dimension)
         
         self._indexes_initialized = True
      
     async def _generate_embedding(self, text: str) -> List[float]:
-        try:
-            if self.hf_client:
-                result = self.hf_client.feature_extraction(
-                    text, 
-                    model="sentence-transformers/all-MiniLM-L6-v2"
-                )
-                
-                if hasattr(result, 'tolist'):
-                    embedding = result.tolist()
-                else:
-                    embedding = list(result)
-                
-                #handling 2d array
-                if isinstance(embedding[0], list):
-                    embedding = embedding[0]
-                
-                if len(embedding) > self.embedding_dimension:
-                    embedding = embedding[:self.embedding_dimension]
-                elif len(embedding) < self.embedding_dimension:
-                    padding = [0.0] * (self.embedding_dimension - len(embedding))
-                    embedding.extend(padding)
-                
-                return embedding
-            else:
-                print('error doing embedding')
-                return self._simple_hash_embedding(text)
-                    
-        except Exception as e:
-            print(f"Error generating embedding: {e}")
-            return self._simple_hash_embedding(text)
-             
-    def _simple_hash_embedding(self, text: str) -> List[float]:
-        
-        hash_obj = hashlib.md5(text.encode())
-        hash_bytes = hash_obj.digest()
-        embedding = []
-        for i in range(0, len(hash_bytes), 4):
-            chunk = hash_bytes[i:i+4]
-            if len(chunk) == 4:
-                val = int.from_bytes(chunk, 'big') / (2**32)
-                embedding.append(val)
+        embeddings = await self._generate_embeddings([text])
+        return embeddings[0]
 
-        while len(embedding) < self.embedding_dimension:
-            embedding.extend(embedding[:min(len(embedding), self.embedding_dimension - len(embedding))])
-        
-        return embedding[:self.embedding_dimension]
+    async def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return await self.embedder.embed_many(texts)
+    
+    def _cache_ttl_seconds(self) -> float:
+        return timedelta(days=self.settings.CACHE_EXPIRY_DAYS).total_seconds()
     
     def _is_expired(self, expires_at) -> bool: 
         if isinstance(expires_at, (int, float)):
@@ -112,27 +69,14 @@ class PineconeService:
     
     @with_retry(max_retries=3)
     async def search_discovery_cache_exact(self, query: str) -> Optional[Dict[str, Any]]:
-        await self._ensure_indexes_exist()
         try:
             normalized_query = self._normalize_search_query(query)            
-            index = self.pc.Index(self.settings.PINECONE_DISCOVERY_INDEX)
-            current_timestamp = datetime.now().timestamp()
-            
-            results = index.query(
-                vector=[0.0] * self.embedding_dimension,
-                top_k=1,
-                include_metadata=True,
-                filter={
-                    "normalized_query": normalized_query,
-                    "expires_at": {"$gt": current_timestamp}
-                }
-            )
+            cached = await asyncio.to_thread(self.kv_cache.get, f"discovery:{normalized_query}")
             
-            if results.matches:
-                match = results.matches[0]
+            if cached:
                 return {
-                    "discovered_products": json.loads(match.metadata["discovered_products"]),
-                    "cached_at": match.metadata["timestamp"],
+                    "discovered_products": cached["discovered_products"],
+                    "cached_at": cached["timestamp"],
                     "similarity_score": 1.0,
                 }
                 
@@ -144,33 +88,19 @@ class PineconeService:
     
     @with_retry(max_retries=3)
     async def cache_discovery_results_exact(self, query: str, products: Dict[str, List[Dict]]) -> str:
-        await self._ensure_indexes_exist()
         try:
             normalized_query = self._normalize_search_query(query)
-            cache_id = str(uuid4())
-            
-            current_time = datetime.now()
-            expires_at_timestamp = (current_time + timedelta(days=self.settings.CACHE_EXPIRY_DAYS)).timestamp()
-        
-            index = self.pc.Index(self.settings.PINECONE_DISCOVERY_INDEX)
+            cache_key = f"discovery:{normalized_query}"
             
-            dummy_embedding = [1.0] + [0.0] * (self.embedding_dimension - 1)
-            
-            index.upsert(vectors=[{
-                "id": cache_id,
-                "values": dummy_embedding,
-                "metadata": {
-                    "search_query": query, 
-                    "normalized_query": normalized_query,
-                    "timestamp": current_time.isoformat(),
-                    "expires_at": expires_at_timestamp,
-                    "discovered_products": json.dumps(products),
-                    "product_count": sum(len(prods) for prods in products.values()),
-                    "is_exact_cache": True
-                }
-            }])
+            await asyncio.to_thread(self.kv_cache.set, cache_key, {
+                "search_query": query, 
+                "normalized_query": normalized_query,
+                "timestamp": datetime.now().isoformat(),
+                "discovered_products": products,
+                "product_count": sum(len(prods) for prods in products.values()),
+            }, ttl_seconds=self._cache_ttl_seconds())
             
-            return cache_id
+            return cache_key
             
         except Exception as e:
             print(f"Error caching discovery results: {e}")
@@ -178,24 +108,10 @@ class PineconeService:
     
     @with_retry(max_retries=3)
     async def search_comparison_cache(self, comparison_id: str) -> Optional[Dict]:
-        await self._ensure_indexes_exist()
         try:
-            index = self.pc.Index(self.settings.PINECONE_REVIEWS_INDEX)
-            results = index.query(
-                vector=[1.0] + [0.0] * (self.embedding_dimension - 1),
-                top_k=1,
-                include_metadata=True,
-                filter={
-                    "comparison_id": comparison_id,
-                    "is_comparison_cache": True,
-                    "expires_at": {"$gt": datetime.now().timestamp()}
-                }
-            )
-            
-            if results.matches:
-                cached_data = results.matches[0].metadata.get("cached_reviews")
-                if cached_data:
-                    return json.loads(cached_data)
+            cached = await asyncio.to_thread(self.kv_cache.get, f"comparison_reviews:{comparison_id}")
+            if cached:
+                return cached["cached_reviews"]
 
             return None
             
@@ -205,10 +121,8 @@ class PineconeService:
 
     @with_retry(max_retries=3)
     async def cache_comparison_results(self, comparison_id: str, reviews: Dict[str, List[Dict]]) -> str:
-        await self._ensure_indexes_exist()
         try:
-            cache_id = str(uuid4())
-            index = self.pc.Index(self.settings.PINECONE_REVIEWS_INDEX)
+            cache_key = f"comparison_reviews:{comparison_id}"
             
             truncated_reviews = {}
             for store, store_reviews in reviews.items():
@@ -227,118 +141,93 @@ class PineconeService:
                     
                     truncated_reviews[store].append(truncated_review)
 
-            dummy_embedding = [1.0] + [0.0] * (self.embedding_dimension - 1)
-
-            metadata = {
+            await asyncio.to_thread(self.kv_cache.set, cache_key, {
                 "comparison_id": comparison_id,
-                "is_comparison_cache": True,
-                "cached_reviews": json.dumps(truncated_reviews),
+                "cached_reviews": truncated_reviews,
                 "timestamp": datetime.now().isoformat(),
-                "expires_at": (datetime.now() + timedelta(days=self.settings.CACHE_EXPIRY_DAYS)).timestamp(),
                 "review_count": sum(len(store_reviews) for store_reviews in reviews.values())
-            }
+            }, ttl_seconds=self._cache_ttl_seconds())
             
-            index.upsert(vectors=[{
-                "id": cache_id,
-                "values": dummy_embedding,
-                "metadata": metadata
-            }])
-            
-            return cache_id
+            return cache_key
             
         except Exception as e:
             print(f"Error caching comparison results: {e}")
             raise
 
     @with_retry(max_retries=3)
-    async def store_comparison_reviews(self, reviews: List[Dict], comparison_id: str, product_id: str, store: str) -> List[str]:
+    async def store_comparison_reviews(
+        self,
+        reviews: List[Dict],
+        comparison_id: str,
+        product_id: str,
+        store: str,
+        on_progress: Optional[Callable[[IngestionStats], Awaitable[None]]] = None
+    ) -> List[str]:
         await self._ensure_indexes_exist()
         try:
-            index = self.pc.Index(self.settings.PINECONE_REVIEWS_INDEX)
-            vectors = []
-            review_ids = []
-            
-            batch_size = 50
-            
-            async def process_review_batch(review_batch):
-                batch_vectors = []
-                batch_ids = []
-
-                embedding_tasks = []
-                for review in review_batch:
-                    if not review.get("review_text"):
-                        continue
-                    review_content = f"Title: {review.get('title', '')} Review: {review.get('review_text', '')}"
-                    embedding_tasks.append(self._generate_embedding(review_content))
-                
-                embeddings = await asyncio.gather(*embedding_tasks, return_exceptions=True)
-                
-                for i, (review, embedding) in enumerate(zip(review_batch, embeddings)):
-                    if isinstance(embedding, Exception):
-                        continue
-                    if not review.get("review_text"):
-                        continue
-                        
-                    review_id = str(uuid4())
-                    batch_ids.append(review_id)
-                    
-                    metadata = {
-                        "id": review_id,
-                        "comparison_id": comparison_id,
-                        "product_id": product_id,
-                        "product_name": (review.get("product_name") or "")[:200],
-                        "store": store,
-                        "review_text": (review.get("review_text") or "")[:1500],
-                        "title": (review.get("title") or "")[:150],
-                        "rating": review.get("rating") or 0,
-                        "author_name": review.get("author_name", "")[:80],
-                        "verified_purchase": review.get("verified_purchase", False),
-                        "timestamp": datetime.now().isoformat(),
-                        "is_comparison_review": True
-                    }
-                    
-                    batch_vectors.append({
-                        "id": review_id,
-                        "values": embedding,
-                        "metadata": metadata
-                    })
-                
-                return batch_vectors, batch_ids
-        
-            batch_tasks = []
-            for i in range(0, len(reviews), batch_size):
-                batch = reviews[i:i + batch_size]
-                batch_tasks.append(process_review_batch(batch))
-            
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            failed_batches = 0
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    failed_batches += 1
-                    continue
-                batch_vectors, batch_ids = result
-                vectors.extend(batch_vectors)
-                review_ids.extend(batch_ids)
-
-            if failed_batches > 0:
-                print(f"WARNING: {failed_batches} batches failed during processing")
+            index = self.vector_client.index(self.settings.PINECONE_REVIEWS_INDEX)
+            namespace = self._review_namespace(comparison_id)
+            
+            storable_reviews = {}
+            for review in reviews:
+                if review.get("review_text"):
+                    storable_reviews.setdefault(make_review_id(store, product_id, review), review)
+            if not storable_reviews:
+                raise Exception(f"No vectors to store for {store}")
+            
+            # reviews already stored in this comparison are neither embedded nor upserted again
+            review_ids = list(storable_reviews.keys())
+            new_review_ids = await asyncio.to_thread(self.seen_reviews.filter_unseen, namespace, review_ids)
+            if not new_review_ids:
+                print(f"All {len(review_ids)} {store} reviews already stored for {comparison_id}")
+                return review_ids
+            
+            def to_text(item):
+                _, review = item
+                return f"Title: {review.get('title', '')} Review: {review.get('review_text', '')}"
+            
+            def to_vector(item, embedding):
+                review_id, review = item
+                metadata = {
+                    "id": review_id,
+                    "comparison_id": comparison_id,
+                    "product_id": product_id,
+                    "product_name": (review.get("product_name") or "")[:200],
+                    "store": store,
+                    "review_text": (review.get("review_text") or "")[:1500],
+                    "title": (review.get("title") or "")[:150],
+                    "rating": review.get("rating") or 0,
+                    "review_date": str(review.get("review_date") or "")[:40],
+                    "author_name": review.get("author_name", "")[:80],
+                    "verified_purchase": review.get("verified_purchase", False),
+                    "duplicate_count": review.get("duplicate_count", 0),
+                    "timestamp": datetime.now().isoformat(),
+                    "is_comparison_review": True
+                }
+                return {
+                    "id": review_id,
+                    "values": embedding,
+                    "metadata": metadata
+                }
             
-            if not vectors:
-                raise Exception(f"No vectors to store for {store} - all batches failed")
-
-            # Store vectors in smaller batches
-            upsert_batch_size = 100
-            failed_upserts = 0
-            for i in range(0, len(vectors), upsert_batch_size):
-                batch = vectors[i:i + upsert_batch_size]
-                try:
-                    index.upsert(vectors=batch)
-                except Exception as e:
-                    failed_upserts += 1
+            async def upsert(vectors):
+                await index.upsert(vectors=vectors, namespace=namespace)
+                await asyncio.to_thread(self.seen_reviews.add, namespace, [vector["id"] for vector in vectors])
+            
+            pipeline = ReviewIngestionPipeline(
+                embed=self._generate_embeddings,
+                upsert=upsert,
+                embed_batch_size=self.settings.INGESTION_EMBED_BATCH_SIZE,
+                upsert_batch_size=self.settings.INGESTION_UPSERT_BATCH_SIZE,
+                queue_size=self.settings.INGESTION_QUEUE_SIZE,
+                upsert_workers=self.settings.INGESTION_UPSERT_WORKERS
+            )
+            new_reviews = [(review_id, storable_reviews[review_id]) for review_id in new_review_ids]
+            stats = await pipeline.run(new_reviews, to_text, to_vector, on_progress=on_progress)
+            print(f"Ingested {store} reviews for {comparison_id}: {stats.to_dict()}, skipped {len(review_ids) - len(new_review_ids)} already stored")
                     
-            if failed_upserts > 0:
-                raise Exception(f"{failed_upserts} upsert batches failed for {store}")
+            if stats.failed_upserts > 0:
+                raise Exception(f"{stats.failed_upserts} upsert batches failed for {store}")
             
             return review_ids
             
@@ -347,46 +236,101 @@ class PineconeService:
             print(f"Error storing comparison reviews: {e}")
             raise
         
+    # the vector store is shared by every instance, the local seen set is not
+    async def has_stored_reviews(self, comparison_id: str) -> bool:
+        await self._ensure_indexes_exist()
+        index = self.vector_client.index(self.settings.PINECONE_REVIEWS_INDEX)
+        return len(await index.list_ids(namespace=self._review_namespace(comparison_id))) > 0
+    
+    async def filter_new_reviews(self, comparison_id: str, product_id: str, store: str, reviews: List[Dict]) -> List[Dict]:
+        """Keeps the reviews not yet stored in this comparison, asking the index about ids this instance hasn't seen"""
+        await self._ensure_indexes_exist()
+        namespace = self._review_namespace(comparison_id)
+        review_ids = [make_review_id(store, product_id, review) for review in reviews]
+        unseen = set(await asyncio.to_thread(self.seen_reviews.filter_unseen, namespace, review_ids))
+        
+        if unseen:
+            index = self.vector_client.index(self.settings.PINECONE_REVIEWS_INDEX)
+            candidates = list(unseen)
+            for i in range(0, len(candidates), 100):
+                result = await index.fetch(ids=candidates[i:i + 100], namespace=namespace)
+                unseen -= set(result.vectors.keys())
+        
+        return [review for review, review_id in zip(reviews, review_ids) if review_id in unseen]
+        
     @with_retry(max_retries=3)
     async def search_reviews_by_comparison(self, comparison_id: str, question: str, top_k: int = 1000) -> List[Dict]:
         await self._ensure_indexes_exist()
         try:
             
             question_embedding = await self._generate_embedding(question)
-            index = self.pc.Index(self.settings.PINECONE_REVIEWS_INDEX)
+            index = self.vector_client.index(self.settings.PINECONE_REVIEWS_INDEX)
             
-            results = index.query(
+            results = await index.query(
                 vector=question_embedding,
                 top_k=top_k,
                 include_metadata=True,
-                filter={"comparison_id": comparison_id, "is_comparison_review": True}
+                namespace=self._review_namespace(comparison_id)
             )
                         
+            return [self._review_from_metadata(match.metadata, match.score) for match in results.matches]
+            
+        except Exception as e:
+            print(f"Error searching reviews by comparison: {e}")
+            return []
+        
+    @with_retry(max_retries=3)
+    async def fetch_all_reviews(self, comparison_id: str) -> List[Dict]:
+        await self._ensure_indexes_exist()
+        try:
+            index = self.vector_client.index(self.settings.PINECONE_REVIEWS_INDEX)
+            namespace = self._review_namespace(comparison_id)
+            
+            review_ids = await index.list_ids(namespace=namespace)
+            
             reviews = []
-            for match in results.matches:
-                review = {
-                    "review_text": match.metadata.get("review_text", ""),
-                    "title": match.metadata.get("title", ""),
-                    "rating": match.metadata.get("rating", 0),
-                    "store": match.metadata.get("store", ""),
-                    "product_name": match.metadata.get("product_name", ""),
-                    "similarity_score": match.score
-                }
-                reviews.append(review)
+            fetch_batch_size = 100
+            for i in range(0, len(review_ids), fetch_batch_size):
+                result = await index.fetch(ids=review_ids[i:i + fetch_batch_size], namespace=namespace)
+                for review_id in review_ids[i:i + fetch_batch_size]:
+                    vector = result.vectors.get(review_id)
+                    if vector and vector.metadata:
+                        reviews.append(self._review_from_metadata(vector.metadata, 1.0))
             
             return reviews
             
         except Exception as e:
-            print(f"Error searching reviews by comparison: {e}")
+            print(f"Error fetching reviews for comparison: {e}")
             return []
+        
+    def _review_namespace(self, comparison_id: str) -> str:
+        return comparison_id
+    
+    def _review_from_metadata(self, metadata: Dict[str, Any], score: float) -> Dict:
+        return {
+            "review_text": metadata.get("review_text", ""),
+            "title": metadata.get("title", ""),
+            "rating": metadata.get("rating", 0),
+            "review_date": metadata.get("review_date", ""),
+            "store": metadata.get("store", ""),
+            "product_name": metadata.get("product_name", ""),
+            "author_name": metadata.get("author_name", ""),
+            "verified_purchase": metadata.get("verified_purchase", False),
+            "duplicate_count": metadata.get("duplicate_count", 0),
+            "similarity_score": score
+        }
     
     async def cleanup_expired_cache(self):
         await self._ensure_indexes_exist()
         try:
-            index = self.pc.Index(self.settings.PINECONE_DISCOVERY_INDEX)
+            purged = await asyncio.to_thread(self.kv_cache.purge_expired)
+            if purged:
+                print(f"Purged {purged} expired key/value cache entries")
+                
+            index = self.vector_client.index(self.settings.PINECONE_DISCOVERY_INDEX)
             
             current_time = datetime.now().isoformat()
-            results = index.query(
+            results = await index.query(
                 vector=[0] * self.embedding_dimension,
                 top_k=10000,
                 include_metadata=True,
@@ -395,7 +339,7 @@ class PineconeService:
             
             if results.matches:
                 expired_ids = [match.id for match in results.matches]
-                index.delete(ids=expired_ids)
+                await index.delete(ids=expired_ids)
                 print(f"Cleaned up {len(expired_ids)} expired cache entries")
                 
         except Exception as e:
@@ -414,28 +358,16 @@ class PineconeService:
     # cache comparison flag
     @with_retry(max_retries = 3)
     async def cache_comparison_flag(self, comparison_id: str, review_count: int) -> str:
-        await self._ensure_indexes_exist()
         try:
-            cache_id = str(uuid4())
-            index = self.pc.Index(self.settings.PINECONE_REVIEWS_INDEX)
+            cache_key = f"comparison_flag:{comparison_id}"
             
-            dummy_embedding = [1.0] + [0.0] * (self.embedding_dimension - 1)
-            
-            metadata = {
+            await asyncio.to_thread(self.kv_cache.set, cache_key, {
                 "comparison_id": comparison_id,
-                "is_comparison_flag": True,
                 "review_count": review_count,
                 "timestamp": datetime.now().isoformat(),
-                "expires_at": (datetime.now() + timedelta(days=self.settings.CACHE_EXPIRY_DAYS)).timestamp(),
-            }
-            
-            index.upsert(vectors=[{
-                "id": cache_id,
-                "values": dummy_embedding,
-                "metadata": metadata
-            }])
+            }, ttl_seconds=self._cache_ttl_seconds())
             
-            return cache_id
+            return cache_key
             
         except Exception as e:
             print(f"Error caching comparison flag: {e}")
@@ -443,22 +375,8 @@ class PineconeService:
         
     @with_retry(max_retries=3)
     async def check_comparison_exists(self, comparison_id: str) -> bool:
-        await self._ensure_indexes_exist()
         try:
-            index = self.pc.Index(self.settings.PINECONE_REVIEWS_INDEX)
-            
-            results = index.query(
-                vector=[1.0] + [0.0] * (self.embedding_dimension - 1),
-                top_k=1,
-                include_metadata=True,
-                filter={
-                    "comparison_id": comparison_id,
-                    "is_comparison_flag": True,
-                    "expires_at": {"$gt": datetime.now().timestamp()}
-                }
-            )
-            
-            return len(results.matches) > 0
+            return await asyncio.to_thread(self.kv_cache.get, f"comparison_flag:{comparison_id}") is not None
             
         except Exception as e:
             print(f"Error checking comparison exists: {e}")
@@ -468,14 +386,16 @@ class PineconeService:
     async def search_discovery_cache_by_key(self, cache_key: str) -> Optional[Dict[str, Any]]:
         await self._ensure_indexes_exist()
         try:
-            index = self.pc.Index(self.settings.PINECONE_DISCOVERY_INDEX)
+            index = self.vector_client.index(self.settings.PINECONE_DISCOVERY_INDEX)
             current_timestamp = datetime.now().timestamp()
+            self.discovery_lookups += 1
             
             try:
-                result = index.fetch(ids=[cache_key])
+                result = await index.fetch(ids=[cache_key])
                 if cache_key in result.vectors:
                     metadata = result.vectors[cache_key].metadata
                     if metadata.get("expires_at", 0) > current_timestamp:
+                        self.discovery_exact_hits += 1
                         return {
                             "discovered_products": json.loads(metadata["discovered_products"]),
                             "cached_at": metadata["timestamp"],
@@ -490,6 +410,73 @@ class PineconeService:
             print(f"Error searching discovery cache: {e}")
             return None
         
+    async def search_discovery_cache_semantic(self, query: str, stores: List[str]) -> Optional[Dict[str, Any]]:
+        """Nearest cached query above the similarity threshold whose products still fit this query"""
+        if not self.settings.DISCOVERY_SEMANTIC_CACHE_ENABLED:
+            return None
+        await self._ensure_indexes_exist()
+        try:
+            index = self.vector_client.index(self.settings.PINECONE_DISCOVERY_INDEX)
+            query_embedding = await self._generate_embedding(query)
+            
+            results = await index.query(
+                vector=query_embedding,
+                top_k=self.settings.DISCOVERY_SEMANTIC_TOP_K,
+                include_metadata=True,
+                filter={"expires_at": {"$gt": datetime.now().timestamp()}}
+            )
+            
+            for match in results.matches:
+                if match.score < self.settings.DISCOVERY_SEMANTIC_THRESHOLD:
+                    break
+                
+                metadata = match.metadata or {}
+                products = json.loads(metadata.get("discovered_products") or "{}")
+                if not self._is_valid_semantic_match(query, metadata.get("search_query", ""), products, stores):
+                    self.discovery_semantic_rejected += 1
+                    continue
+                
+                self.discovery_semantic_hits += 1
+                print(f"Semantic discovery cache hit for '{query}': '{metadata.get('search_query')}' ({match.score:.3f})")
+                return {
+                    "discovered_products": products,
+                    "cached_at": metadata.get("timestamp"),
+                    "similarity_score": match.score,
+                }
+            
+            return None
+            
+        except Exception as e:
+            print(f"Error searching semantic discovery cache: {e}")
+            return None
+    
+    def _is_valid_semantic_match(self, query: str, cached_query: str, products: Dict[str, List[Dict]], stores: List[str]) -> bool:
+        # close embeddings still differ on model numbers ("iphone 14" vs "iphone 15")
+        query_tokens = _query_tokens(query)
+        model_tokens = _model_tokens(query_tokens)
+        if model_tokens != _model_tokens(_query_tokens(cached_query)):
+            return False
+        
+        # every store must have cached products that mention the model, or some query word
+        required = model_tokens or {token for token in query_tokens if len(token) > 2}
+        for store in stores:
+            names = set()
+            for product in products.get(store) or []:
+                names |= _query_tokens(product.get("name", ""))
+            if not names or (required and not required & names):
+                return False
+        return True
+    
+    def discovery_cache_stats(self) -> Dict[str, Any]:
+        hits = self.discovery_exact_hits + self.discovery_semantic_hits
+        return {
+            "lookups": self.discovery_lookups,
+            "exact_hits": self.discovery_exact_hits,
+            "semantic_hits": self.discovery_semantic_hits,
+            "semantic_rejected": self.discovery_semantic_rejected,
+            "hit_rate": round(hits / self.discovery_lookups, 3) if self.discovery_lookups else 0.0,
+        }
+        
     @with_retry(max_retries=3)
     async def cache_discovery_results_by_key(self, cache_key: str, query: str, products: Dict[str, List[Dict]]) -> str:
         await self._ensure_indexes_exist()
@@ -497,10 +484,10 @@ class PineconeService:
             current_time = datetime.now()
             expires_at_timestamp = (current_time + timedelta(days=self.settings.CACHE_EXPIRY_DAYS)).timestamp()
         
-            index = self.pc.Index(self.settings.PINECONE_DISCOVERY_INDEX)
+            index = self.vector_client.index(self.settings.PINECONE_DISCOVERY_INDEX)
             query_embedding = await self._generate_embedding(query)
             
-            index.upsert(vectors=[{
+            await index.upsert(vectors=[{
                 "id": cache_key,
                 "values": query_embedding,
                 "metadata": {
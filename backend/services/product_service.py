@@ -56,6 +56,8 @@ class ProductService:
         try:
             cache_key = self._generate_cache_key(query)
             cached_results = await self.pinecone.search_discovery_cache_by_key(cache_key)
+            if not cached_results:
+                cached_results = await self.pinecone.search_discovery_cache_semantic(query, list(self.extractors.keys()))
             if cached_results:
                 return self._convert_cached_to_products(cached_results["discovered_products"])
             
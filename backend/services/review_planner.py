@@ -0,0 +1,94 @@
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import math
+
+
+def plan_review_pages(
+    target: int,
+    first_page_reviews: int,
+    page_size: int,
+    total_pages: int,
+    review_count: int = 0,
+    max_pages: int = 10,
+    overfetch: float = 1.2
+) -> List[int]:
+    """Chooses which pages after page 1 to fetch to reach `target` usable reviews.
+
+    The estimate uses the page size and the share of usable reviews seen on
+    page 1, padded by `overfetch`, and is capped by the pages the product
+    actually has (from pagination or review_count) and by `max_pages`.
+    """
+    remaining = target - first_page_reviews
+    if remaining <= 0 or page_size <= 0:
+        return []
+
+    usable_per_page = max(first_page_reviews, 1)
+    pages_needed = math.ceil(remaining / usable_per_page * overfetch)
+
+    available = max(total_pages, 1)
+    if review_count:
+        available = max(available, math.ceil(review_count / page_size))
+
+    last_page = min(1 + pages_needed, available, max(max_pages, 1))
+    return list(range(2, last_page + 1))
+
+
+class ReviewPageFetcher:
+    """Fetches planned review pages with bounded concurrency and stops early.
+
+    Each worker fetches and parses one page at a time, so fetching the next
+    page overlaps parsing of the previous one. Once `target` reviews are in
+    no new pages are started and pages still in flight are cancelled.
+    """
+
+    def __init__(self, fetch_page: Callable[[int], Awaitable[List[Dict]]], concurrency: int = 3):
+        self.fetch_page = fetch_page
+        self.concurrency = max(1, concurrency)
+
+    async def run(
+        self,
+        pages: List[int],
+        target: int,
+        collected: int = 0,
+        on_page: Optional[Callable[[int, List[Dict]], Awaitable[None]]] = None
+    ) -> Dict[int, List[Dict]]:
+        results: Dict[int, List[Dict]] = {}
+        pending = iter(pages)
+        enough = asyncio.Event()
+        count = collected
+
+        async def worker():
+            nonlocal count
+            for page in pending:
+                if enough.is_set():
+                    return
+                try:
+                    reviews = await self.fetch_page(page)
+                except Exception as e:
+                    print(f"Error extracting page {page}: {e}")
+                    continue
+
+                results[page] = reviews
+                count += len(reviews)
+                if on_page is not None:
+                    await on_page(page, reviews)
+                if count >= target:
+                    enough.set()
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(pages)))]
+        if not workers:
+            return results
+
+        async def finish():
+            await asyncio.gather(*workers, return_exceptions=True)
+            enough.set()
+
+        finisher = asyncio.create_task(finish())
+        try:
+            await enough.wait()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, finisher, return_exceptions=True)
+
+        return results
@@ -1,56 +1,124 @@
 from services.brightdata import BrightDataClient
+from services.snapshot_manager import SnapshotManager
+from services.review_planner import ReviewPageFetcher, plan_review_pages
 from services.pinecone_service import PineconeService
+from services.review_watermarks import ReviewWatermarks, get_review_watermarks, parse_review_date
 from core.config import get_settings
 from services.gemini import GeminiModel
-import json 
-import httpx
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
+from utils.minhash import MinHashDeduplicator
+from services.parse_pool import get_parse_pool
+from extractors import walmart_reviews
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
 import hashlib
 import re
 import asyncio 
 
+EmitEvent = Optional[Callable[[Dict], Awaitable[None]]]
+
+# strong references to extractions that outlive their streaming request
+_background_tasks = set()
+
+
+async def _ignore_event(event: Dict):
+    pass
+
+
 class ReviewExtractionService:
-    def __init__(self):
-        self.bright_data = BrightDataClient()
-        self.pinecone = PineconeService()
+    def __init__(
+            self,
+            bright_data_client: Optional[BrightDataClient] = None,
+            pinecone_service: Optional[PineconeService] = None,
+            gemini_model: Optional[GeminiModel] = None,
+            snapshot_manager: Optional[SnapshotManager] = None,
+            review_watermarks: Optional[ReviewWatermarks] = None
+        ):
+        self.bright_data = bright_data_client or BrightDataClient()
+        self.pinecone = pinecone_service or PineconeService()
         self.settings = get_settings()
-        self.gemini = GeminiModel()
+        self.snapshots = snapshot_manager or SnapshotManager(
+            self.bright_data,
+            dataset_id=self.settings.AMAZON_REVIEWS_DATASET_ID,
+            max_rows_per_url=self.settings.MAX_REVIEWS_PER_STORE
+        )
+        self.gemini = gemini_model or GeminiModel()
+        self.deduplicator = MinHashDeduplicator(threshold=self.settings.REVIEW_DEDUP_THRESHOLD)
+        self.watermarks = review_watermarks or get_review_watermarks()
         
         
     # extracting reviews for product
     async def extract_reviews_for_products(
         self, 
         selected_products: Dict[str, Dict],
+        emit: EmitEvent = None,
+        refresh: bool = False
     ) -> Dict[str, List[Dict]]:
+        emit = emit or _ignore_event
         
         comparison_id = self._generate_comparison_id(selected_products)
         
         
         # checking if reviews already exists
-        if await self.pinecone.check_comparison_exists(comparison_id):
-            all_reviews = await self.pinecone.search_reviews_by_comparison(
-                comparison_id=comparison_id,
-                question="product reviews",
-                top_k=1000
-            )
+        if not refresh and await self.pinecone.check_comparison_exists(comparison_id):
+            all_reviews = await self.pinecone.fetch_all_reviews(comparison_id)
             
             cached_reviews = {}
             for store in selected_products.keys():
                 cached_reviews[store] = [r for r in all_reviews if r.get("store") == store][:100]
+                await emit({"event": "reviews", "store": store, "cached": True, "reviews": cached_reviews[store]})
             
             return cached_reviews
+        
+        # an expired or refreshed comparison only fetches the reviews posted since the last run
+        if self.settings.REVIEW_REFRESH_ENABLED and await self.pinecone.has_stored_reviews(comparison_id):
+            return await self._refresh_reviews(selected_products, comparison_id, emit)
 
-        fresh_reviews = await self._extract_fresh_reviews(selected_products)
+        fresh_reviews = await self._extract_fresh_reviews(selected_products, emit)
+        fresh_reviews = self._deduplicate_reviews(fresh_reviews)
+        await emit({
+            "event": "extracted",
+            "counts": {store: len(store_reviews) for store, store_reviews in fresh_reviews.items()}
+        })
         try:
-            await self._store_reviews_with_comparison_id(fresh_reviews, comparison_id, selected_products)
+            await self._store_reviews_with_comparison_id(fresh_reviews, comparison_id, selected_products, emit)
+            await self._advance_watermarks(comparison_id, selected_products, fresh_reviews)
             
             total_reviews = sum(len(store_reviews) for store_reviews in fresh_reviews.values())
             await self.pinecone.cache_comparison_flag(comparison_id, total_reviews)
+            await emit({"event": "ingested", "comparison_id": comparison_id, "total_reviews": total_reviews})
                         
         except Exception as e:
             print("Returning fresh reviews without caching due to storage failure")
+            await emit({"event": "ingestion_failed", "comparison_id": comparison_id, "detail": str(e)})
         return fresh_reviews
+    
+    # same as extract_reviews_for_products, yielding progress events as they happen
+    async def stream_reviews_for_products(self, selected_products: Dict[str, Dict], refresh: bool = False) -> AsyncIterator[Dict]:
+        events: asyncio.Queue = asyncio.Queue()
+        
+        async def run():
+            try:
+                reviews = await self.extract_reviews_for_products(selected_products, emit=events.put, refresh=refresh)
+                await events.put({
+                    "event": "done",
+                    "total_reviews": sum(len(store_reviews) for store_reviews in reviews.values())
+                })
+            except Exception as e:
+                print(f"Error in streaming review extraction: {e}")
+                await events.put({"event": "error", "detail": str(e)})
+            finally:
+                await events.put(None)
+        
+        # the extraction keeps running if the client goes away so the comparison still gets cached
+        task = asyncio.create_task(run())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        
+        yield {"event": "started", "comparison_id": self._generate_comparison_id(selected_products)}
+        while True:
+            event = await events.get()
+            if event is None:
+                return
+            yield event
         
     # generating comparison id
     def _generate_comparison_id(self, selected_products: Dict[str, Dict]) -> str:
@@ -68,14 +136,15 @@ class ReviewExtractionService:
     
                 
     # extracting fresh reviews
-    async def _extract_fresh_reviews(self, selected_products: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+    async def _extract_fresh_reviews(self, selected_products: Dict[str, Dict], emit: EmitEvent = None) -> Dict[str, List[Dict]]:
+        emit = emit or _ignore_event
         tasks = []
         
         for store, product in selected_products.items(): 
             if store == "amazon":
-                tasks.append(self._extract_amazon_reviews(product))
+                tasks.append(self._extract_amazon_reviews(product, emit))
             elif store == "walmart":
-                tasks.append(self._extract_walmart_reviews(product))
+                tasks.append(self._extract_walmart_reviews(product, emit))
                 
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
@@ -86,17 +155,119 @@ class ReviewExtractionService:
                 print(f"Error extracting reviews for {store}: {reviews}")
                 all_reviews[store] = []
             else:
-                all_reviews[store] = reviews[:100]
+                all_reviews[store] = reviews[:self.settings.MAX_REVIEWS_PER_STORE]
                 print(f"Successfully extractted {len(reviews)} reviews for {store}")
                 
         return all_reviews
     
     
+    # extending a stored comparison with the reviews newer than each product's watermark
+    async def _refresh_reviews(
+        self,
+        selected_products: Dict[str, Dict],
+        comparison_id: str,
+        emit: EmitEvent = None
+    ) -> Dict[str, List[Dict]]:
+        emit = emit or _ignore_event
+        
+        new_reviews = await self._extract_new_reviews(selected_products, comparison_id, emit)
+        new_reviews = self._deduplicate_reviews(new_reviews)
+        await emit({
+            "event": "extracted",
+            "refresh": True,
+            "counts": {store: len(store_reviews) for store, store_reviews in new_reviews.items()}
+        })
+        
+        stored = True
+        try:
+            await self._store_reviews_with_comparison_id(new_reviews, comparison_id, selected_products, emit)
+            await self._advance_watermarks(comparison_id, selected_products, new_reviews)
+        except Exception as e:
+            stored = False
+            print("Returning refreshed reviews without extending the comparison due to storage failure")
+            await emit({"event": "ingestion_failed", "comparison_id": comparison_id, "detail": str(e)})
+        
+        all_reviews = await self.pinecone.fetch_all_reviews(comparison_id)
+        refreshed_reviews = {}
+        for store in selected_products.keys():
+            store_reviews = [r for r in all_reviews if r.get("store") == store]
+            store_reviews.sort(key=lambda r: parse_review_date(r.get("review_date")) or "", reverse=True)
+            if not stored:
+                store_reviews = new_reviews.get(store, []) + store_reviews
+            refreshed_reviews[store] = store_reviews[:self.settings.MAX_REVIEWS_PER_STORE]
+        
+        if stored:
+            await self.pinecone.cache_comparison_flag(comparison_id, len(all_reviews))
+            await emit({
+                "event": "ingested",
+                "comparison_id": comparison_id,
+                "total_reviews": len(all_reviews),
+                "new_reviews": sum(len(store_reviews) for store_reviews in new_reviews.values())
+            })
+        return refreshed_reviews
+    
+    async def _extract_new_reviews(
+        self,
+        selected_products: Dict[str, Dict],
+        comparison_id: str,
+        emit: EmitEvent = None
+    ) -> Dict[str, List[Dict]]:
+        emit = emit or _ignore_event
+        tasks = []
+        
+        for store, product in selected_products.items():
+            if store == "amazon":
+                tasks.append(self._extract_new_amazon_reviews(product, comparison_id, emit))
+            elif store == "walmart":
+                tasks.append(self._extract_new_walmart_reviews(product, comparison_id, emit))
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        new_reviews = {}
+        for (store, product), reviews in zip(selected_products.items(), results):
+            if isinstance(reviews, Exception):
+                print(f"Error refreshing reviews for {store}: {reviews}")
+                new_reviews[store] = []
+            else:
+                new_reviews[store] = reviews
+                print(f"Found {len(reviews)} new reviews for {store}")
+        
+        return new_reviews
+    
+    async def _advance_watermarks(self, comparison_id: str, selected_products: Dict[str, Dict], reviews: Dict[str, List[Dict]]):
+        for store, store_reviews in reviews.items():
+            if store in selected_products and store_reviews:
+                await asyncio.to_thread(self.watermarks.advance, comparison_id, store, selected_products[store]["id"], store_reviews)
+    
+    # collapsing syndicated and copy-pasted reviews across stores and pages
+    def _deduplicate_reviews(self, reviews: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        if not self.settings.REVIEW_DEDUP_ENABLED:
+            return reviews
+        
+        flattened = [(store, review) for store, store_reviews in reviews.items() for review in store_reviews]
+        kept, duplicate_counts = self.deduplicator.deduplicate(
+            flattened,
+            lambda item: f"{item[1].get('title', '')} {item[1].get('review_text', '')}"
+        )
+        
+        deduplicated = {store: [] for store in reviews.keys()}
+        for position, (store, review) in enumerate(kept):
+            review["duplicate_count"] = duplicate_counts.get(position, 0)
+            deduplicated[store].append(review)
+            
+        for store in reviews.keys():
+            removed = len(reviews[store]) - len(deduplicated[store])
+            if removed:
+                print(f"Collapsed {removed} near-duplicate {store} reviews")
+        
+        return deduplicated
+    
     async def _store_reviews_with_comparison_id(
         self, 
         reviews: Dict[str, List[Dict]],
         comparison_id: str, 
-        selected_products: Dict[str, Dict]
+        selected_products: Dict[str, Dict],
+        emit: EmitEvent = None
     ):
         try:
             store_tasks = []
@@ -105,7 +276,7 @@ class ReviewExtractionService:
                 if store in selected_products and store_reviews:
                     product = selected_products[store]
                     store_tasks.append(
-                        self._store_store_reviews(store_reviews, comparison_id, product["id"], store)
+                        self._store_store_reviews(store_reviews, comparison_id, product["id"], store, emit)
                     )
             
             results = await asyncio.gather(*store_tasks, return_exceptions=True)
@@ -119,138 +290,158 @@ class ReviewExtractionService:
         except Exception as e: 
             raise
     
-    async def _store_store_reviews(self, store_reviews: List[Dict], comparison_id: str, product_id: str, store: str):
-        try:
-            batch_size = 50 
-            batch_tasks = []
-            
-            for i in range(0, len(store_reviews), batch_size):
-                batch_reviews = store_reviews[i:i + batch_size]
-                batch_tasks.append(
-                    self.pinecone.store_comparison_reviews(
-                        reviews=batch_reviews, 
-                        comparison_id=comparison_id, 
-                        product_id=product_id,
-                        store=store,
-                    )
-                )
-            
-            results = await asyncio.gather(*batch_tasks, return_exceptions=True)
+    async def _store_store_reviews(self, store_reviews: List[Dict], comparison_id: str, product_id: str, store: str, emit: EmitEvent = None):
+        emit = emit or _ignore_event
         
-            # Add error checking
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    raise result        
-            
-        except Exception as e:
-            raise
+        async def on_progress(stats):
+            await emit({
+                "event": "ingestion",
+                "store": store,
+                "reviews": stats.reviews,
+                "embedded": stats.embedded,
+                "upserted": stats.upserted,
+                "failed_batches": stats.failed_upserts
+            })
+        
+        # the pinecone service streams embedding and upsert batches itself
+        await self.pinecone.store_comparison_reviews(
+            reviews=store_reviews, 
+            comparison_id=comparison_id, 
+            product_id=product_id,
+            store=store,
+            on_progress=on_progress
+        )
         
         
     # ========== EXTRACTING AMAZON AND WALMART REVIEWS ============
-    async def _extract_amazon_reviews(self, product: Dict) -> List[Dict]:
+    async def _extract_amazon_reviews(self, product: Dict, emit: EmitEvent = None) -> List[Dict]:
+        emit = emit or _ignore_event
         try:
             clean_url = self._clean_amazon_url(product["url"])
             
-            async with httpx.AsyncClient(timeout=120.0) as client: 
-                response = await client.post(
-                    "https://api.brightdata.com/datasets/v3/trigger",
-                    headers={
-                        "Authorization": f"Bearer {self.settings.BRIGHT_DATA_API_KEY}",
-                        "Content-Type": "application/json"
-                    },
-                    json=[{"url": clean_url}],
-                    params={
-                        "dataset_id": "gd_le8e811kzy4ggddlq",
-                        "include_errors": "true"
-                    }
-                )
-                trigger_result = response.json()
-                snapshot_id = trigger_result.get("snapshot_id")
-                
-                if not snapshot_id:
-                    print("No snaphsot_id received")
-                    return []
-                
-                reviews_data = await self._poll_amazon_results(snapshot_id)
-                
-                standardized_reviews = []
-                for review in reviews_data[:100]:
-                    if review.get("review_text"):
-                        standardized_reviews.append({
-                            "review_text": review.get("review_text", ""),
-                            "title": review.get("review_header", ""),
-                            "rating": review.get("rating", 0),
-                            "review_date": review.get("review_posted_date", ""),
-                            "helpful_votes": review.get("helpful_count", 0),
-                            "product_name": product["name"],
-                            "author_name": review.get("author_name", ""),
-                            "verified_purchase": review.get("is_verified", False)
-                        })
-                        
-                return standardized_reviews
+            reviews_data = await self.snapshots.collect(clean_url)
+            
+            standardized_reviews = []
+            for review in reviews_data[:self.settings.MAX_REVIEWS_PER_STORE]:
+                if review.get("review_text"):
+                    standardized_reviews.append({
+                        "review_text": review.get("review_text", ""),
+                        "title": review.get("review_header", ""),
+                        "rating": review.get("rating", 0),
+                        "review_date": review.get("review_posted_date", ""),
+                        "helpful_votes": review.get("helpful_count", 0),
+                        "product_name": product["name"],
+                        "author_name": review.get("author_name", ""),
+                        "verified_purchase": review.get("is_verified", False)
+                    })
+            
+            await emit({"event": "reviews", "store": "amazon", "page": 1, "reviews": standardized_reviews})
+            return standardized_reviews
         except Exception as e: 
             print(f"Error extracting amazon reviews: {e}")
             return []
         
         
         
-    async def _extract_walmart_reviews(self, product: Dict) -> List[Dict]:
+    async def _extract_walmart_reviews(self, product: Dict, emit: EmitEvent = None) -> List[Dict]:
+        emit = emit or _ignore_event
         try:
             product_id = self._extract_walmart_product_id(product["url"])
             if not product_id:
                 return []
             
-            first_page_url = f"https://www.walmart.com/reviews/product/{product_id}?entryPoint=viewAllReviewsBottom"
-            first_page_html = await self.bright_data.get_product_page(first_page_url)
-            total_pages = self._get_walmart_total_pages(first_page_html)
-            max_pages = min(total_pages, 5)
+            target = self.settings.MAX_REVIEWS_PER_STORE
+            review_url = f"https://www.walmart.com/reviews/product/{product_id}?entryPoint=viewAllReviewsBottom"
             
-            semaphore = asyncio.Semaphore(3)
+            # page 1 tells us the page size and page count, and its reviews are kept
+            first_page_html = await self.bright_data.get_product_page(review_url, is_valid=walmart_reviews.is_review_page)
+            first_page = await get_parse_pool().run(walmart_reviews.parse_first_page, first_page_html, product["name"])
+            await emit({"event": "reviews", "store": "walmart", "page": 1, "reviews": first_page["reviews"]})
             
-            async def extract_page_with_semaphore(page):
-                async with semaphore:
-                    page_url = f"https://www.walmart.com/reviews/product/{product_id}?entryPoint=viewAllReviewsBottom&page={page}"
-                    return await self._extract_walmart_page_reviews_bs(page_url, product["name"])
+            pages = plan_review_pages(
+                target=target,
+                first_page_reviews=len(first_page["reviews"]),
+                page_size=first_page["page_size"],
+                total_pages=first_page["total_pages"],
+                review_count=first_page["review_count"] or product.get("review_count") or 0,
+                max_pages=self.settings.WALMART_MAX_REVIEW_PAGES
+            )
+            print(f"Fetching {len(pages)} more walmart review pages for {product_id}")
             
-        
-            page_tasks = [extract_page_with_semaphore(page) for page in range(1, max_pages + 1)]
-            page_results = await asyncio.gather(*page_tasks, return_exceptions=True)
+            fetcher = ReviewPageFetcher(
+                lambda page: self._extract_walmart_page_reviews_bs(f"{review_url}&page={page}", product["name"]),
+                concurrency=self.settings.WALMART_REVIEW_PAGE_CONCURRENCY
+            )
+            
+            async def on_page(page, reviews):
+                await emit({"event": "reviews", "store": "walmart", "page": page, "reviews": reviews})
+            
+            page_results = await fetcher.run(pages, target=target, collected=len(first_page["reviews"]), on_page=on_page)
 
-            all_reviews = []
-            for page_num, page_reviews in enumerate(page_results, 1):
-                if isinstance(page_reviews, Exception):
-                    print(f"Error exxtracting page {page_num}")
-                elif isinstance(page_reviews, list):
-                    all_reviews.extend(page_reviews)
+            all_reviews = list(first_page["reviews"])
+            for page in sorted(page_results):
+                all_reviews.extend(page_results[page])
                     
-            return all_reviews[:100]
+            return all_reviews[:target]
                     
         except Exception as e: 
             print(f"Error extracting walmart reviews: {e}")
             return []
         
+    # the amazon dataset has no sort order, so known reviews are skipped after collection
+    async def _extract_new_amazon_reviews(self, product: Dict, comparison_id: str, emit: EmitEvent = None) -> List[Dict]:
+        emit = emit or _ignore_event
+        reviews = await self._extract_amazon_reviews(product)
+        
+        watermark = await asyncio.to_thread(self.watermarks.get, comparison_id, "amazon", product["id"])
+        new_reviews = [
+            review for review in await self.pinecone.filter_new_reviews(comparison_id, product["id"], "amazon", reviews)
+            if not self.watermarks.is_behind(watermark, "amazon", product["id"], review)
+        ]
+        
+        await emit({"event": "reviews", "store": "amazon", "page": 1, "reviews": new_reviews})
+        return new_reviews
+    
+    # reads newest-first pages until it reaches a review at or behind the watermark
+    async def _extract_new_walmart_reviews(self, product: Dict, comparison_id: str, emit: EmitEvent = None) -> List[Dict]:
+        emit = emit or _ignore_event
+        product_id = self._extract_walmart_product_id(product["url"])
+        if not product_id:
+            return []
+        
+        target = self.settings.MAX_REVIEWS_PER_STORE
+        watermark = await asyncio.to_thread(self.watermarks.get, comparison_id, "walmart", product["id"])
+        review_url = f"https://www.walmart.com/reviews/product/{product_id}?entryPoint=viewAllReviewsBottom&sort=submission-desc"
+        
+        new_reviews = []
+        for page in range(1, self.settings.WALMART_MAX_REVIEW_PAGES + 1):
+            page_reviews = await self._extract_walmart_page_reviews_bs(f"{review_url}&page={page}", product["name"])
+            if not page_reviews:
+                break
+            
+            new_on_page = await self.pinecone.filter_new_reviews(comparison_id, product["id"], "walmart", page_reviews)
+            unseen = {id(review) for review in new_on_page}
+            page_new = []
+            reached_known = False
+            for review in page_reviews:
+                if id(review) not in unseen or self.watermarks.is_behind(watermark, "walmart", product["id"], review):
+                    reached_known = True
+                    break
+                page_new.append(review)
+            
+            if page_new:
+                new_reviews.extend(page_new)
+                await emit({"event": "reviews", "store": "walmart", "page": page, "reviews": page_new})
+            if reached_known or len(new_reviews) >= target:
+                break
+        
+        return new_reviews[:target]
+    
     # extracting page content
     async def _extract_walmart_page_reviews_bs(self, page_url: str, product_name: str) -> List[Dict]:
         try:
-            html = await self.bright_data.get_product_page(page_url)
-            soup = BeautifulSoup(html, "html.parser")
-            reviews = []
-            review_containers = soup.find_all("div", class_=lambda x: x and "overflow-visible" in x and "b--none" in x and "dark-gray" in x)
-            
-            if not review_containers:
-                review_containers = soup.find_all("div", class_="overflow-visible")
-                review_containers = [container for container in review_containers if 
-                                container.find("div", class_="f7 gray flex flex-auto flex-none-l tr tl-l justify-end justify-start-l")]
-
-            for container in review_containers:
-                try:
-                    review_data = self._parse_walmart_review_container(container, product_name)
-                    if review_data:
-                        reviews.append(review_data)
-                except Exception as e:
-                    continue
-            
-            return reviews
+            html = await self.bright_data.get_product_page(page_url, is_valid=walmart_reviews.is_review_page)
+            return await get_parse_pool().run(walmart_reviews.parse_review_page, html, product_name)
         
         except Exception as e:
             print(f"Error extracting page reviews: {e}")
@@ -270,136 +461,7 @@ class ReviewExtractionService:
                 return match.group(1)
         return None
     
-    # getting walmart total pages
-    def _get_walmart_total_pages(self, html: str) -> int:
-        soup = BeautifulSoup(html, "html.parser")
-        
-        pagination = soup.find("nav", {"aria-label": "pagination"})
-        if not pagination:
-            return 1
-        
-        page_links = pagination.find_all("a", {"data-automation-id": "page-number"})
-        if not page_links:
-            return 1
-        
-        max_page = 1
-        for link in page_links:
-            try:
-                page_num = int(link.get_text(strip=True))
-                max_page = max(max_page, page_num)
-            except (ValueError, TypeError):
-                continue
-        
-        return max_page
     
-    # extrating walmart content scraping
-    def _parse_walmart_review_container(self, container, product_name: str) -> Optional[Dict]:
-        try:
-            # extracting date
-            date_elem = container.find("div", class_=lambda x: x and "f7" in x and "gray" in x and "flex" in x and "justify-end" in x)
-            if not date_elem:
-                date_elem = container.find("div", class_="f7 gray flex flex-auto flex-none-l tr tl-l justify-end justify-start-l")
-            review_date = date_elem.get_text(strip=True) if date_elem else ""
-            
-            # extracting reviewer name
-            name_elem = container.find("span", class_=lambda x: x and "f7" in x and "b" in x and "mv0" in x)
-            if not name_elem:
-                name_elem = container.find("span", class_="f7 b mv0")
-            reviewer_name = name_elem.get_text(strip=True) if name_elem else ""
-            
-            # extracting rating
-            star_container = container.find("div", class_=lambda x: x and "w_ExHd" in x and "w_y6ym" in x)
-            rating = 0
-            if star_container:
-                filled_stars = star_container.find_all("svg", class_=lambda x: x and "w_1jp4" in x)
-                rating = len(filled_stars)
-            
-            # extracting review title
-            title_elem = container.find("h3", class_=lambda x: x and "w_kV33" in x and "w_Sl3f" in x and "w_mvVb" in x)
-            if not title_elem:
-                title_elem = container.find("h3", class_="w_kV33 w_Sl3f w_mvVb f5 b")
-            review_title = title_elem.get_text(strip=True) if title_elem else ""
-            
-            # extracting review text
-            text_container = container.find("span", class_=lambda x: x and "tl-m" in x and "db-m" in x)
-            review_text = ""
-            if text_container:
-                for b_tag in text_container.find_all("b"):
-                    b_tag.decompose()
-                review_text = text_container.get_text(strip=True)
-            
-            # extracting helpful votes
-            helpful_votes = 0
-            upvote_buttons = container.find_all("button", {"aria-label": lambda x: x and "Upvote" in x})
-            for upvote_button in upvote_buttons:
-                vote_span = upvote_button.find("span", class_=lambda x: x and "ml1" in x and "f7" in x and "dark-gray" in x)
-                if vote_span:
-                    vote_text = vote_span.get_text(strip=True)
-                    vote_match = re.search(r'\((\d+)\)', vote_text)
-                    if vote_match:
-                        helpful_votes = int(vote_match.group(1))
-                        break
-            
-            # extracting verified purchase status
-            verified_purchase = False
-            verified_elems = container.find_all("span", class_=lambda x: x and "b" in x and "f7" in x and "dark-gray" in x)
-            for elem in verified_elems:
-                if "Verified Purchase" in elem.get_text():
-                    verified_purchase = True
-                    break
-            
-            if review_text and rating > 0:
-                return {
-                    "review_text": review_text,
-                    "title": review_title,
-                    "rating": rating,
-                    "review_date": review_date,
-                    "helpful_votes": helpful_votes,
-                    "product_name": product_name,
-                    "author_name": reviewer_name,
-                    "verified_purchase": verified_purchase
-                }
-            
-            return None
-            
-        except Exception as e:
-            print(f"Error parsing review container: {e}")
-            return None
-        
-    # checking the status of snapshot and adding a poll mechanism
-    async def _poll_amazon_results(self, snapshot_id: str, max_wait: int = 120) -> List[Dict]:
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                intervals = [2, 2, 3, 5, 5, 10, 10, 15, 15, 20]
-                
-                for i, interval in enumerate(intervals):
-                    if sum(intervals[:i+1]) >= max_wait:
-                        break
-                
-                    print(f"Polling Amazon snapshot {snapshot_id}, attempt {i + 1}")
-                    
-                    response = await client.get(
-                        f"https://api.brightdata.com/datasets/v3/snapshot/{snapshot_id}",
-                        headers={"Authorization": f"Bearer {self.settings.BRIGHT_DATA_API_KEY}"},
-                        params={"format": "json"}
-                    )
-                    
-                    if response.status_code == 200:
-                        try:
-                            reviews_data = response.json()
-                            if isinstance(reviews_data, list) and len(reviews_data) > 0:
-                                return reviews_data
-                        except json.JSONDecodeError as e:
-                            print(f"JSON decode error: {e}")
-                
-                    await asyncio.sleep(interval)
-                
-                return []
-                
-        except Exception as e:
-            print(f"Error polling Amazon results: {e}")
-            return []
-        
     # cleaning amazon url
     def _clean_amazon_url(self, url: str) -> str:
         match = re.search(r'(https://www\.amazon\.com/[^/]+/dp/[A-Z0-9]{10})', url)
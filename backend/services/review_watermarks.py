@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional
+import re
+from core.config import get_settings
+from services.kv_cache import KVCache, get_kv_cache
+from services.seen_reviews import make_review_id
+
+_DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%B %d, %Y", "%b %d, %Y", "%d %B %Y"]
+_DATE_PATTERNS = [
+    re.compile(r"\d{4}-\d{2}-\d{2}"),
+    re.compile(r"\d{1,2}/\d{1,2}/\d{4}"),
+    re.compile(r"[A-Z][a-z]+\.? \d{1,2}, \d{4}"),
+    re.compile(r"\d{1,2} [A-Z][a-z]+ \d{4}"),
+]
+
+
+def parse_review_date(value) -> Optional[str]:
+    """Normalizes store date strings ("Reviewed in ... on March 3, 2024", "3/3/2024", ISO) to YYYY-MM-DD"""
+    text = str(value or "")
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        candidate = match.group(0).replace(".", "")
+        for date_format in _DATE_FORMATS:
+            try:
+                return datetime.strptime(candidate, date_format).date().isoformat()
+            except ValueError:
+                continue
+    return None
+
+
+class ReviewWatermarks:
+    """Newest review date and id already ingested, per comparison, store and product.
+
+    Reviews are stored per comparison namespace, so a product shared by two
+    comparisons keeps one watermark in each.
+
+    A refresh reads pages newest-first and stops at the first review that is
+    at or behind the watermark, so only reviews posted since the last run are
+    fetched and embedded. Watermarks live in the local KV cache; an instance
+    without one still stops at the first review the vector store holds.
+    """
+
+    def __init__(self, kv_cache: KVCache, ttl_days: int = 90):
+        self.kv_cache = kv_cache
+        self.ttl_seconds = timedelta(days=ttl_days).total_seconds()
+
+    def _key(self, comparison_id: str, store: str, product_id: str) -> str:
+        return f"review_watermark:{comparison_id}:{store}:{product_id}"
+
+    def get(self, comparison_id: str, store: str, product_id: str) -> Optional[Dict]:
+        return self.kv_cache.get(self._key(comparison_id, store, product_id))
+
+    def advance(self, comparison_id: str, store: str, product_id: str, reviews: List[Dict]) -> Optional[Dict]:
+        """Moves the watermark to the newest dated review in `reviews`, never backwards"""
+        dated = [(parse_review_date(review.get("review_date")), review) for review in reviews]
+        dated = [(date, review) for date, review in dated if date]
+        current = self.get(comparison_id, store, product_id)
+        if not dated:
+            return current
+
+        newest_date, newest_review = max(dated, key=lambda item: item[0])
+        if current and current.get("newest_date", "") > newest_date:
+            return current
+
+        watermark = {
+            "newest_date": newest_date,
+            "newest_id": make_review_id(store, product_id, newest_review),
+            "updated_at": datetime.now().isoformat(),
+        }
+        self.kv_cache.set(self._key(comparison_id, store, product_id), watermark, ttl_seconds=self.ttl_seconds)
+        return watermark
+
+    def is_behind(self, watermark: Optional[Dict], store: str, product_id: str, review: Dict) -> bool:
+        """True when the review is the watermark review or was posted before it"""
+        if not watermark:
+            return False
+        if make_review_id(store, product_id, review) == watermark.get("newest_id"):
+            return True
+        review_date = parse_review_date(review.get("review_date"))
+        return review_date is not None and review_date < watermark.get("newest_date", "")
+
+
+@lru_cache
+def get_review_watermarks() -> ReviewWatermarks:
+    settings = get_settings()
+    return ReviewWatermarks(get_kv_cache(), ttl_days=settings.REVIEW_WATERMARK_TTL_DAYS)
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from core.config import get_settings
+
+
+def _normalize(value) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def make_review_id(store: str, product_id: str, review: Dict) -> str:
+    """Deterministic review id so re-ingesting the same review is an idempotent upsert"""
+    content = "\x1f".join([
+        _normalize(store),
+        _normalize(product_id),
+        _normalize(review.get("review_text")),
+        _normalize(review.get("author_name")),
+        _normalize(review.get("review_date")),
+    ])
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+    return f"{store}_{digest}"
+
+
+class SeenReviewSet:
+    """Persisted set of review ids already stored per namespace.
+
+    Lookups are served from an in-memory set per namespace that is loaded
+    from SQLite the first time the namespace is touched; only the
+    `max_namespaces` most recently used namespaces stay in memory.
+
+    The SQLite file is local to this instance, so on a multi-instance deploy
+    each instance only knows what it stored itself. That is safe because
+    review ids are content hashes and upserts are idempotent: an unseen id
+    costs a redundant embed and upsert, never a duplicate. Decisions that
+    must agree across instances ask the vector store instead.
+    """
+
+    def __init__(self, path: str, max_namespaces: int = 256):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.max_namespaces = max(1, max_namespaces)
+        self._lock = threading.Lock()
+        self._loaded: "OrderedDict[str, Set[str]]" = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_reviews ("
+            "namespace TEXT NOT NULL, review_id TEXT NOT NULL, added_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, review_id))"
+        )
+
+    def _namespace_set(self, namespace: str) -> Set[str]:
+        seen = self._loaded.get(namespace)
+        if seen is None:
+            rows = self._conn.execute("SELECT review_id FROM seen_reviews WHERE namespace = ?", (namespace,))
+            seen = {row[0] for row in rows}
+            self._loaded[namespace] = seen
+            while len(self._loaded) > self.max_namespaces:
+                self._loaded.popitem(last=False)
+        else:
+            self._loaded.move_to_end(namespace)
+        return seen
+
+    def filter_unseen(self, namespace: str, review_ids: Iterable[str]) -> List[str]:
+        with self._lock:
+            seen = self._namespace_set(namespace)
+            return [review_id for review_id in review_ids if review_id not in seen]
+
+    def add(self, namespace: str, review_ids: Iterable[str]):
+        review_ids = list(review_ids)
+        if not review_ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._namespace_set(namespace).update(review_ids)
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_reviews (namespace, review_id, added_at) VALUES (?, ?, ?)",
+                [(namespace, review_id, now) for review_id in review_ids]
+            )
+            self._conn.execute("COMMIT")
+
+    def forget(self, namespace: str):
+        with self._lock:
+            self._loaded.pop(namespace, None)
+            self._conn.execute("DELETE FROM seen_reviews WHERE namespace = ?", (namespace,))
+
+
+@lru_cache
+def get_seen_review_set() -> SeenReviewSet:
+    settings = get_settings()
+    return SeenReviewSet(
+        os.path.join(settings.LOCAL_CACHE_DIR, "seen_reviews.sqlite3"),
+        max_namespaces=settings.SEEN_REVIEWS_MEMORY_NAMESPACES
+    )
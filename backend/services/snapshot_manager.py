@@ -0,0 +1,315 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import asyncio
+import re
+import time
+from services.brightdata import BrightDataClient, SnapshotDownload
+
+_ASIN_RE = re.compile(r"/(?:dp|gp/product)/([A-Z0-9]{10})")
+
+
+def _product_key(url: str) -> str:
+    match = _ASIN_RE.search(url or "")
+    return match.group(1) if match else (url or "").rstrip("/")
+
+
+@dataclass
+class _Snapshot:
+    snapshot_id: str
+    futures: Dict[str, asyncio.Future]
+    deadline: float
+    interval: float
+    next_poll_at: float = 0.0
+    polls: int = 0
+
+
+@dataclass
+class SnapshotStats:
+    triggers: int = 0
+    batched_urls: int = 0
+    coalesced_urls: int = 0
+    polls: int = 0
+    webhook_completions: int = 0
+    timeouts: int = 0
+    trigger_failures: int = 0
+    downloads: int = 0
+    early_cutoffs: int = 0
+    bytes_read: int = 0
+    bytes_skipped: int = 0
+    # cutoffs on chunked downloads, whose skipped bytes are unknown and not in bytes_skipped
+    cutoffs_unknown_size: int = 0
+    parse_seconds: float = 0.0
+
+    def record_download(self, result: SnapshotDownload):
+        self.downloads += 1
+        self.bytes_read += result.bytes_read
+        self.parse_seconds += result.parse_seconds
+        if result.bytes_skipped is not None:
+            self.bytes_skipped += result.bytes_skipped
+        if result.cutoff:
+            self.early_cutoffs += 1
+            if result.bytes_skipped is None:
+                self.cutoffs_unknown_size += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = dict(self.__dict__)
+        stats["parse_seconds"] = round(stats["parse_seconds"], 3)
+        return stats
+
+
+class SnapshotManager:
+    """Batches dataset triggers and multiplexes snapshot polling for one dataset.
+
+    URLs requested within `batch_window_seconds` of each other go out in a
+    single trigger call. One background poller checks every pending snapshot,
+    backing off per snapshot from `poll_min_seconds` to `poll_max_seconds`,
+    and a webhook can complete a snapshot early through `notify`. Snapshots
+    are streamed as NDJSON and the download stops once every product in the
+    batch has `max_rows_per_url` reviews.
+    """
+
+    def __init__(
+        self,
+        bright_data: BrightDataClient,
+        dataset_id: str,
+        batch_window_seconds: float = 0.5,
+        max_batch_size: int = 20,
+        poll_min_seconds: float = 2.0,
+        poll_max_seconds: float = 20.0,
+        timeout_seconds: float = 120.0,
+        max_rows_per_url: int = 100,
+        notify_url: str = "",
+        notify_secret: str = ""
+    ):
+        self.bright_data = bright_data
+        self.dataset_id = dataset_id
+        self.batch_window_seconds = batch_window_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        self.poll_min_seconds = poll_min_seconds
+        self.poll_max_seconds = max(poll_min_seconds, poll_max_seconds)
+        self.timeout_seconds = timeout_seconds
+        self.max_rows_per_url = max(1, max_rows_per_url)
+        self.notify_url = notify_url
+        self.notify_secret = notify_secret
+
+        self.counters = SnapshotStats()
+        self._batch: Dict[str, asyncio.Future] = {}
+        self._batch_urls: Dict[str, str] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # batches handed to trigger_dataset whose snapshot id is not known yet
+        self._triggering: Dict[str, asyncio.Future] = {}
+        self._snapshots: Dict[str, _Snapshot] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def collect(self, url: str) -> List[Dict]:
+        """Returns the dataset rows for one product url, [] on failure or timeout"""
+        future = self._enqueue(url)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout_seconds + self.batch_window_seconds)
+        except asyncio.TimeoutError:
+            print(f"Timed out waiting for snapshot rows of {url}")
+            return []
+        except Exception as e:
+            print(f"Error collecting snapshot rows of {url}: {e}")
+            return []
+
+    def _enqueue(self, url: str) -> asyncio.Future:
+        key = _product_key(url)
+
+        # the same product already waiting in the batch, being triggered or in a running snapshot
+        existing = self._batch.get(key) or self._triggering.get(key) or next(
+            (snapshot.futures[key] for snapshot in self._snapshots.values() if key in snapshot.futures),
+            None
+        )
+        if existing is not None and not existing.done():
+            self.counters.coalesced_urls += 1
+            return existing
+
+        future = asyncio.get_running_loop().create_future()
+        self._batch[key] = future
+        self._batch_urls[key] = url
+
+        if len(self._batch) >= self.max_batch_size:
+            self._start_flush(delay=0)
+        elif self._flush_task is None or self._flush_task.done():
+            self._start_flush(delay=self.batch_window_seconds)
+        return future
+
+    def _start_flush(self, delay: float):
+        if delay == 0:
+            batch, urls = self._take_batch()
+            asyncio.create_task(self._trigger(batch, urls))
+        else:
+            self._flush_task = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float):
+        await asyncio.sleep(delay)
+        batch, urls = self._take_batch()
+        if batch:
+            await self._trigger(batch, urls)
+
+    def _take_batch(self):
+        batch, urls = self._batch, self._batch_urls
+        self._batch, self._batch_urls = {}, {}
+        self._triggering.update(batch)
+        return batch, urls
+
+    async def _trigger(self, batch: Dict[str, asyncio.Future], urls: Dict[str, str]):
+        try:
+            await self._register(batch, urls)
+        finally:
+            for key in batch:
+                if self._triggering.get(key) is batch[key]:
+                    del self._triggering[key]
+
+    async def _register(self, batch: Dict[str, asyncio.Future], urls: Dict[str, str]):
+        try:
+            snapshot_id = await self.bright_data.trigger_dataset(
+                dataset_id=self.dataset_id,
+                inputs=[{"url": urls[key]} for key in batch],
+                notify_url=self.notify_url or None,
+                notify_secret=self.notify_secret or None
+            )
+        except Exception as e:
+            snapshot_id = None
+            print(f"Error triggering snapshot: {e}")
+
+        if not snapshot_id:
+            print("No snaphsot_id received")
+            self.counters.trigger_failures += 1
+            for future in batch.values():
+                if not future.done():
+                    future.set_result([])
+            return
+
+        self.counters.triggers += 1
+        self.counters.batched_urls += len(batch)
+        print(f"Triggered snapshot {snapshot_id} for {len(batch)} urls")
+
+        now = time.monotonic()
+        self._snapshots[snapshot_id] = _Snapshot(
+            snapshot_id=snapshot_id,
+            futures=batch,
+            deadline=now + self.timeout_seconds,
+            interval=self.poll_min_seconds,
+            next_poll_at=now + self.poll_min_seconds
+        )
+        self._ensure_poller()
+
+    def _ensure_poller(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self):
+        while self._snapshots:
+            self._wakeup.clear()
+            now = time.monotonic()
+
+            for snapshot in [s for s in self._snapshots.values() if s.deadline <= now]:
+                print(f"Snapshot {snapshot.snapshot_id} timed out")
+                self.counters.timeouts += 1
+                self._complete(snapshot.snapshot_id, {})
+
+            due = [s for s in self._snapshots.values() if s.next_poll_at <= now]
+            if due:
+                await asyncio.gather(*(self._poll(snapshot) for snapshot in due))
+                continue
+
+            if not self._snapshots:
+                break
+            next_at = min(min(s.next_poll_at, s.deadline) for s in self._snapshots.values())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(0.0, next_at - now))
+            except asyncio.TimeoutError:
+                pass
+
+    def _collector(self, snapshot: _Snapshot):
+        """Routes rows with review text to their product, stopping once every product is full"""
+        grouped: Dict[str, List[Dict]] = {key: [] for key in snapshot.futures}
+        single_key = next(iter(grouped)) if len(grouped) == 1 else None
+
+        def on_row(row: Dict) -> bool:
+            if not row.get("review_text"):
+                return False
+            if single_key is not None:
+                key = single_key
+            else:
+                source = row.get("input", {}).get("url") if isinstance(row.get("input"), dict) else None
+                key = _product_key(source or row.get("url") or row.get("asin") or "")
+            rows = grouped.get(key)
+            if rows is not None and len(rows) < self.max_rows_per_url:
+                rows.append(row)
+            return all(len(rows) >= self.max_rows_per_url for rows in grouped.values())
+
+        return grouped, on_row
+
+    async def _poll(self, snapshot: _Snapshot):
+        snapshot.polls += 1
+        self.counters.polls += 1
+        print(f"Polling snapshot {snapshot.snapshot_id}, attempt {snapshot.polls}")
+
+        grouped, on_row = self._collector(snapshot)
+        try:
+            result = await self.bright_data.stream_snapshot(snapshot.snapshot_id, on_row)
+        except Exception as e:
+            print(f"Error polling snapshot {snapshot.snapshot_id}: {e}")
+            result = None
+
+        # a ready snapshot may have no rows at all, only a missing one means poll again
+        if result is not None:
+            self.counters.record_download(result)
+            self._complete(snapshot.snapshot_id, grouped)
+            return
+
+        # adaptive backoff, each empty poll waits longer up to the cap
+        snapshot.interval = min(snapshot.interval * 1.5, self.poll_max_seconds)
+        snapshot.next_poll_at = time.monotonic() + snapshot.interval
+
+    def notify(self, snapshot_id: str, rows: Optional[List[Dict]] = None) -> bool:
+        """Webhook entry point: completes the snapshot with pushed rows or polls it right away"""
+        snapshot = self._snapshots.get(snapshot_id)
+        if snapshot is None:
+            return False
+
+        self.counters.webhook_completions += 1
+        if rows:
+            grouped, on_row = self._collector(snapshot)
+            for row in rows:
+                if isinstance(row, dict) and on_row(row):
+                    break
+            self._complete(snapshot_id, grouped)
+        else:
+            snapshot.next_poll_at = 0.0
+            self._ensure_poller()
+        return True
+
+    def _complete(self, snapshot_id: str, grouped: Dict[str, List[Dict]]):
+        snapshot = self._snapshots.pop(snapshot_id, None)
+        if snapshot is None:
+            return
+
+        for key, future in snapshot.futures.items():
+            if not future.done():
+                future.set_result(grouped.get(key, []))
+
+    async def close(self):
+        for task in (self._flush_task, self._poller):
+            if task is not None and not task.done():
+                task.cancel()
+        for snapshot_id in list(self._snapshots):
+            self._complete(snapshot_id, {})
+        for future in list(self._triggering.values()):
+            if not future.done():
+                future.set_result([])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters.to_dict(),
+            "pending_snapshots": len(self._snapshots),
+            "batched_waiting": len(self._batch),
+            "triggering": len(self._triggering),
+        }
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Optional
+import asyncio
+import threading
+from core.config import get_settings
+from services.vector_store import VectorStore, get_vector_store
+
+
+class AsyncVectorIndex:
+    """Runs the blocking calls of one index handle on the client's thread pool"""
+
+    def __init__(self, index, executor: ThreadPoolExecutor):
+        self._index = index
+        self._executor = executor
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def upsert(self, vectors: List[Dict[str, Any]], namespace: str = ""):
+        return await self._run(self._index.upsert, vectors=vectors, namespace=namespace)
+
+    async def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        include_metadata: bool = True,
+        filter: Optional[Dict[str, Any]] = None,
+        namespace: str = ""
+    ):
+        kwargs = {
+            "vector": vector,
+            "top_k": top_k,
+            "include_metadata": include_metadata,
+            "namespace": namespace,
+        }
+        if filter is not None:
+            kwargs["filter"] = filter
+        return await self._run(self._index.query, **kwargs)
+
+    async def fetch(self, ids: List[str], namespace: str = ""):
+        return await self._run(self._index.fetch, ids=ids, namespace=namespace)
+
+    async def delete(self, ids: List[str], namespace: str = ""):
+        return await self._run(self._index.delete, ids=ids, namespace=namespace)
+
+    async def list_ids(self, namespace: str = "") -> List[str]:
+        def collect():
+            ids = []
+            for id_page in self._index.list(namespace=namespace):
+                ids.extend(id_page)
+            return ids
+        return await self._run(collect)
+
+
+class AsyncVectorClient:
+    """Process-wide vector client.
+
+    Index handles are created once per name and shared, index existence is
+    checked once per process, and every blocking vector-store call runs on a
+    bounded thread pool instead of the event loop.
+    """
+
+    def __init__(self, store: VectorStore, max_workers: int = 8):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="vector-client")
+        self._indexes: Dict[str, AsyncVectorIndex] = {}
+        self._ensured = set()
+        self._lock = threading.Lock()
+        self._ensure_lock = asyncio.Lock()
+
+    async def ensure_index(self, name: str, dimension: int, metric: str = "cosine"):
+        if name in self._ensured:
+            return
+        async with self._ensure_lock:
+            if name in self._ensured:
+                return
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, partial(self.store.ensure_index, name, dimension, metric))
+            self._ensured.add(name)
+
+    def index(self, name: str) -> AsyncVectorIndex:
+        with self._lock:
+            if name not in self._indexes:
+                self._indexes[name] = AsyncVectorIndex(self.store.index(name), self._executor)
+            return self._indexes[name]
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_vector_client() -> AsyncVectorClient:
+    settings = get_settings()
+    return AsyncVectorClient(get_vector_store(), max_workers=settings.VECTOR_CLIENT_MAX_WORKERS)
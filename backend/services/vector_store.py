@@ -0,0 +1,466 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import json
+import os
+import sqlite3
+import threading
+import numpy as np
+from core.config import get_settings
+
+
+@dataclass
+class VectorMatch:
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class QueryResult:
+    matches: List[VectorMatch]
+
+
+@dataclass
+class FetchedVector:
+    id: str
+    values: List[float]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class FetchResult:
+    vectors: Dict[str, FetchedVector]
+
+
+class VectorIndex(ABC):
+    """The subset of the Pinecone Index API that OpinionFlow relies on"""
+
+    @abstractmethod
+    def upsert(self, vectors: List[Dict[str, Any]], namespace: str = ""):
+        pass
+
+    @abstractmethod
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        include_metadata: bool = True,
+        filter: Optional[Dict[str, Any]] = None,
+        namespace: str = ""
+    ) -> QueryResult:
+        pass
+
+    @abstractmethod
+    def fetch(self, ids: List[str], namespace: str = "") -> FetchResult:
+        pass
+
+    @abstractmethod
+    def delete(self, ids: List[str], namespace: str = ""):
+        pass
+
+    @abstractmethod
+    def list(self, prefix: Optional[str] = None, namespace: str = "") -> Iterator[List[str]]:
+        """Yields pages of vector ids in a namespace"""
+
+
+class VectorStore(ABC):
+
+    @abstractmethod
+    def ensure_index(self, name: str, dimension: int, metric: str = "cosine"):
+        pass
+
+    @abstractmethod
+    def index(self, name: str):
+        pass
+
+
+class PineconeVectorStore(VectorStore):
+
+    def __init__(self, api_key: str, environment: str):
+        from pinecone import Pinecone
+
+        self.pc = Pinecone(api_key=api_key)
+        self.environment = environment
+
+    def ensure_index(self, name: str, dimension: int, metric: str = "cosine"):
+        from pinecone import ServerlessSpec
+
+        if name in self.pc.list_indexes().names():
+            return
+
+        self.pc.create_index(
+            name=name,
+            dimension=dimension,
+            metric=metric,
+            spec=ServerlessSpec(
+                cloud="aws",
+                region=self.environment
+            )
+        )
+
+    def index(self, name: str):
+        return self.pc.Index(name)
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+
+    try:
+        for operator, operand in condition.items():
+            if operator == "$eq" and not value == operand:
+                return False
+            if operator == "$ne" and not value != operand:
+                return False
+            if operator == "$gt" and not (value is not None and value > operand):
+                return False
+            if operator == "$gte" and not (value is not None and value >= operand):
+                return False
+            if operator == "$lt" and not (value is not None and value < operand):
+                return False
+            if operator == "$lte" and not (value is not None and value <= operand):
+                return False
+            if operator == "$in" and value not in operand:
+                return False
+            if operator == "$nin" and value in operand:
+                return False
+    except TypeError:
+        # pinecone treats comparisons across types as non-matching
+        return False
+    return True
+
+
+def _equality_value(condition: Any):
+    if isinstance(condition, dict):
+        if set(condition.keys()) == {"$eq"}:
+            condition = condition["$eq"]
+        else:
+            return None
+    if isinstance(condition, (str, bool)):
+        return condition
+    return None
+
+
+class LocalVectorIndex(VectorIndex):
+    """Brute-force cosine index over a memory-mapped float32 matrix.
+
+    Vectors live in ``vectors.f32`` (one normalized row per id) and ids,
+    namespaces and metadata in a SQLite sidecar. Namespaces and equality
+    filters on string/bool metadata are answered from inverted indexes, so
+    queries only score matching rows. When hnswlib is installed, queries whose
+    candidate set is large use an in-memory HNSW graph instead of a scan.
+    """
+
+    LIST_PAGE_SIZE = 100
+
+    def __init__(self, path: str, dimension: int, hnsw_threshold: int = 20000):
+        self.path = path
+        self.dimension = dimension
+        self.hnsw_threshold = hnsw_threshold
+        self._lock = threading.RLock()
+
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, "vectors.f32")
+
+        self._conn = sqlite3.connect(os.path.join(path, "metadata.sqlite3"), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vectors ("
+            "namespace TEXT NOT NULL, id TEXT NOT NULL, row INTEGER NOT NULL, metadata TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, id))"
+        )
+
+        self._row_by_key: Dict[Tuple[str, str], int] = {}
+        self._key_by_row: Dict[int, Tuple[str, str]] = {}
+        self._namespace_rows: Dict[str, Set[int]] = {}
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {}
+        self._free_rows: List[int] = []
+        self._hnsw = None
+
+        size = 0
+        for namespace, item_id, row, metadata in self._conn.execute("SELECT namespace, id, row, metadata FROM vectors"):
+            self._register_row((namespace, item_id), row)
+            self._metadata[row] = json.loads(metadata)
+            self._index_metadata(row, self._metadata[row])
+            size = max(size, row + 1)
+
+        self._free_rows = [row for row in range(size) if row not in self._key_by_row]
+        self._size = size
+        self._capacity = 0
+        self._matrix = None
+        self._open_matrix(max(size, 1024))
+
+    # ========== STORAGE ============
+    def _open_matrix(self, capacity: int):
+        existing_rows = 0
+        if os.path.exists(self._vectors_path):
+            existing_rows = os.path.getsize(self._vectors_path) // (4 * self.dimension)
+
+        capacity = max(capacity, existing_rows)
+        if existing_rows < capacity:
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(capacity * 4 * self.dimension)
+
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+        self._capacity = capacity
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._size >= self._capacity:
+            self._open_matrix(self._capacity * 2)
+        row = self._size
+        self._size += 1
+        return row
+
+    def _register_row(self, key: Tuple[str, str], row: int):
+        self._row_by_key[key] = row
+        self._key_by_row[row] = key
+        self._namespace_rows.setdefault(key[0], set()).add(row)
+
+    def _unregister_row(self, key: Tuple[str, str]) -> Optional[int]:
+        row = self._row_by_key.pop(key, None)
+        if row is None:
+            return None
+        del self._key_by_row[row]
+        self._namespace_rows.get(key[0], set()).discard(row)
+        return row
+
+    def _index_metadata(self, row: int, metadata: Dict[str, Any]):
+        for key, value in metadata.items():
+            if isinstance(value, (str, bool)):
+                self._postings.setdefault(key, {}).setdefault(value, set()).add(row)
+
+    def _unindex_metadata(self, row: int, metadata: Dict[str, Any]):
+        for key, value in metadata.items():
+            if isinstance(value, (str, bool)):
+                rows = self._postings.get(key, {}).get(value)
+                if rows:
+                    rows.discard(row)
+
+    def _normalize(self, vector) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32).reshape(-1)[:self.dimension]
+        if array.shape[0] < self.dimension:
+            array = np.pad(array, (0, self.dimension - array.shape[0]))
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
+    # ========== INDEX API ============
+    def upsert(self, vectors: List[Dict[str, Any]], namespace: str = ""):
+        with self._lock:
+            rows_to_write = []
+            for vector in vectors:
+                key = (namespace, vector["id"])
+                metadata = vector.get("metadata") or {}
+
+                row = self._row_by_key.get(key)
+                if row is None:
+                    row = self._allocate_row()
+                    self._register_row(key, row)
+                else:
+                    self._unindex_metadata(row, self._metadata.get(row, {}))
+
+                self._matrix[row] = self._normalize(vector["values"])
+                self._metadata[row] = metadata
+                self._index_metadata(row, metadata)
+                rows_to_write.append((namespace, key[1], row, json.dumps(metadata)))
+
+            self._matrix.flush()
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vectors (namespace, id, row, metadata) VALUES (?, ?, ?, ?)",
+                rows_to_write
+            )
+            self._conn.execute("COMMIT")
+
+            if self._hnsw is not None:
+                self._add_to_hnsw([row for _, _, row, _ in rows_to_write])
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        include_metadata: bool = True,
+        filter: Optional[Dict[str, Any]] = None,
+        namespace: str = ""
+    ) -> QueryResult:
+        with self._lock:
+            query_vector = self._normalize(vector)
+            candidates = self._filter_rows(namespace, filter)
+
+            if len(candidates) >= self.hnsw_threshold and self._ensure_hnsw():
+                rows, scores = self._query_hnsw(query_vector, candidates, top_k)
+            else:
+                rows, scores = self._query_brute_force(query_vector, candidates, top_k)
+
+            matches = [
+                VectorMatch(
+                    id=self._key_by_row[row][1],
+                    score=float(score),
+                    metadata=dict(self._metadata[row]) if include_metadata else {}
+                )
+                for row, score in zip(rows, scores)
+            ]
+            return QueryResult(matches=matches)
+
+    def fetch(self, ids: List[str], namespace: str = "") -> FetchResult:
+        with self._lock:
+            vectors = {}
+            for item_id in ids:
+                row = self._row_by_key.get((namespace, item_id))
+                if row is None:
+                    continue
+                vectors[item_id] = FetchedVector(
+                    id=item_id,
+                    values=self._matrix[row].tolist(),
+                    metadata=dict(self._metadata[row])
+                )
+            return FetchResult(vectors=vectors)
+
+    def delete(self, ids: List[str], namespace: str = ""):
+        with self._lock:
+            deleted = []
+            for item_id in ids:
+                row = self._unregister_row((namespace, item_id))
+                if row is None:
+                    continue
+                self._unindex_metadata(row, self._metadata.pop(row, {}))
+                self._free_rows.append(row)
+                deleted.append((namespace, item_id))
+                if self._hnsw is not None:
+                    self._hnsw.mark_deleted(row)
+
+            if deleted:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("DELETE FROM vectors WHERE namespace = ? AND id = ?", deleted)
+                self._conn.execute("COMMIT")
+
+    def list(self, prefix: Optional[str] = None, namespace: str = "") -> Iterator[List[str]]:
+        with self._lock:
+            ids = sorted(
+                self._key_by_row[row][1] for row in self._namespace_rows.get(namespace, set())
+            )
+        if prefix:
+            ids = [item_id for item_id in ids if item_id.startswith(prefix)]
+        for i in range(0, len(ids), self.LIST_PAGE_SIZE):
+            yield ids[i:i + self.LIST_PAGE_SIZE]
+
+    def count(self) -> int:
+        return len(self._row_by_key)
+
+    # ========== SEARCH ============
+    def _filter_rows(self, namespace: str, filter: Optional[Dict[str, Any]]) -> List[int]:
+        candidates: Set[int] = self._namespace_rows.get(namespace, set())
+        if not filter:
+            return list(candidates)
+
+        remaining = {}
+        for key, condition in filter.items():
+            value = _equality_value(condition)
+            if value is None:
+                remaining[key] = condition
+                continue
+            candidates = candidates & self._postings.get(key, {}).get(value, set())
+            if not candidates:
+                return []
+
+        return [
+            row for row in candidates
+            if all(_matches_condition(self._metadata[row].get(key), condition) for key, condition in remaining.items())
+        ]
+
+    def _query_brute_force(self, query_vector: np.ndarray, rows: List[int], top_k: int):
+        if not rows or top_k <= 0:
+            return [], []
+
+        row_array = np.asarray(rows, dtype=np.int64)
+        scores = self._matrix[row_array] @ query_vector
+
+        if top_k < len(scores):
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return row_array[top].tolist(), scores[top].tolist()
+
+    def _ensure_hnsw(self) -> bool:
+        if self._hnsw is not None:
+            return True
+        try:
+            import hnswlib
+        except ImportError:
+            return False
+
+        self._hnsw = hnswlib.Index(space="cosine", dim=self.dimension)
+        self._hnsw.init_index(max_elements=max(self._capacity, 1024), ef_construction=200, M=16)
+        self._hnsw.set_ef(128)
+        self._add_to_hnsw(list(self._key_by_row.keys()))
+        return True
+
+    def _add_to_hnsw(self, rows: List[int]):
+        if not rows:
+            return
+        if self._hnsw.get_max_elements() < self._capacity:
+            self._hnsw.resize_index(self._capacity)
+        row_array = np.asarray(rows, dtype=np.int64)
+        self._hnsw.add_items(self._matrix[row_array], row_array, replace_deleted=False)
+
+    def _query_hnsw(self, query_vector: np.ndarray, rows: List[int], top_k: int):
+        k = min(top_k, len(rows))
+        if k <= 0:
+            return [], []
+
+        if len(rows) == self.count():
+            labels, distances = self._hnsw.knn_query(query_vector, k=k)
+        else:
+            allowed = set(rows)
+            labels, distances = self._hnsw.knn_query(query_vector, k=k, num_threads=1, filter=lambda label: label in allowed)
+        return labels[0].tolist(), (1.0 - distances[0]).tolist()
+
+
+class LocalVectorStore(VectorStore):
+    """In-process vector store that keeps each index under its own directory"""
+
+    def __init__(self, root: str, hnsw_threshold: int = 20000):
+        self.root = root
+        self.hnsw_threshold = hnsw_threshold
+        self._indexes: Dict[str, LocalVectorIndex] = {}
+        self._dimensions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def ensure_index(self, name: str, dimension: int, metric: str = "cosine"):
+        if metric != "cosine":
+            raise ValueError(f"Local vector store only supports cosine metric, got {metric}")
+        self._dimensions[name] = dimension
+
+    def index(self, name: str) -> LocalVectorIndex:
+        with self._lock:
+            if name not in self._indexes:
+                dimension = self._dimensions.get(name, get_settings().EMBEDDING_DIMENSION)
+                self._indexes[name] = LocalVectorIndex(
+                    os.path.join(self.root, name),
+                    dimension=dimension,
+                    hnsw_threshold=self.hnsw_threshold
+                )
+            return self._indexes[name]
+
+
+@lru_cache
+def get_vector_store() -> VectorStore:
+    settings = get_settings()
+
+    if settings.VECTOR_STORE_BACKEND == "local":
+        return LocalVectorStore(
+            root=os.path.join(settings.LOCAL_CACHE_DIR, "vectors"),
+            hnsw_threshold=settings.LOCAL_VECTOR_HNSW_THRESHOLD
+        )
+
+    return PineconeVectorStore(
+        api_key=settings.PINECONE_API_KEY,
+        environment=settings.PINECONE_ENVIRONMENT
+    )
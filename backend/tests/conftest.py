@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the app imports modules relative to backend/, as uvicorn does when started from there
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,60 @@
+import asyncio
+import json
+from extractors import amazon
+from services.brightdata import BrightDataClient
+from services.page_cache import PageCache
+
+PRODUCT_HTML = '<html><span id="productTitle">Headphones</span></html>'
+CAPTCHA_HTML = '<html><form action="/errors/validateCaptcha">Type the characters</form></html>'
+
+
+class UnlockerResponses:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def __call__(self, url, zone, format="raw"):
+        self.calls += 1
+        status_code, body = self.responses.pop(0)
+        return json.dumps({"status_code": status_code, "body": body})
+
+
+def _client(tmp_path, responses):
+    client = BrightDataClient(page_cache=PageCache(str(tmp_path)), serp_cache=object())
+    client._make_request = responses
+    return client
+
+
+def _fetch_twice(client):
+    async def scenario():
+        first = await client.get_product_page("https://www.amazon.com/dp/B000000001", is_valid=amazon.is_product_page)
+        second = await client.get_product_page("https://www.amazon.com/dp/B000000001", is_valid=amazon.is_product_page)
+        return first, second
+
+    return asyncio.run(scenario())
+
+
+def test_successful_product_pages_are_cached(tmp_path):
+    responses = UnlockerResponses((200, PRODUCT_HTML))
+
+    assert _fetch_twice(_client(tmp_path, responses)) == (PRODUCT_HTML, PRODUCT_HTML)
+    assert responses.calls == 1
+
+
+def test_error_responses_are_not_cached(tmp_path):
+    responses = UnlockerResponses((503, "<html>Service Unavailable</html>"), (200, PRODUCT_HTML))
+
+    first, second = _fetch_twice(_client(tmp_path, responses))
+
+    assert second == PRODUCT_HTML
+    assert responses.calls == 2
+
+
+def test_block_pages_are_not_cached(tmp_path):
+    responses = UnlockerResponses((200, CAPTCHA_HTML), (200, PRODUCT_HTML))
+
+    first, second = _fetch_twice(_client(tmp_path, responses))
+
+    assert first == CAPTCHA_HTML
+    assert second == PRODUCT_HTML
+    assert responses.calls == 2
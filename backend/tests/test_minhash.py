@@ -0,0 +1,46 @@
+from utils.minhash import MinHashDeduplicator
+
+BASE = (
+    "The battery lasts two full days and the noise cancelling blocks out the whole "
+    "train ride, although the case feels a little cheap for the price I paid"
+)
+
+
+def test_near_duplicates_collapse_into_the_first_text():
+    dedup = MinHashDeduplicator(threshold=0.8)
+    texts = [BASE, "Shipping was slow but support helped quickly", BASE.upper() + "!!"]
+
+    assert dedup.group(texts) == [0, 1, 0]
+
+
+def test_similar_texts_below_the_threshold_stay_separate():
+    edited = BASE.replace("a little cheap", "really sturdy")
+
+    # the default REVIEW_DEDUP_THRESHOLD keeps them apart, a looser one merges them
+    assert MinHashDeduplicator(threshold=0.8).group([BASE, edited]) == [0, 1]
+    assert MinHashDeduplicator(threshold=0.6).group([BASE, edited]) == [0, 0]
+
+
+def test_non_ascii_reviews_are_not_merged():
+    texts = ["👍👍", "💯💯💯", "Отличный товар", "Плохой товар, сломался"]
+
+    assert MinHashDeduplicator().group(texts) == [0, 1, 2, 3]
+
+
+def test_non_ascii_duplicates_still_collapse():
+    texts = ["Отличный товар, всем советую", "отличный  товар, всем советую!", "💯💯💯", "💯💯💯"]
+
+    assert MinHashDeduplicator().group(texts) == [0, 0, 2, 2]
+
+
+def test_texts_without_shingles_are_never_grouped():
+    assert MinHashDeduplicator().group(["", "   ", "\n"]) == [0, 1, 2]
+
+
+def test_deduplicate_counts_collapsed_items():
+    items = [{"text": BASE}, {"text": "different review entirely here"}, {"text": BASE}, {"text": BASE}]
+
+    kept, duplicate_counts = MinHashDeduplicator().deduplicate(items, lambda item: item["text"])
+
+    assert kept == items[:2]
+    assert duplicate_counts == {0: 2}
@@ -0,0 +1,39 @@
+import os
+from services.page_cache import PageCache
+
+
+def _body_files(directory):
+    return [name for _, _, names in os.walk(directory) for name in names if name.endswith((".html.zst", ".html.gz"))]
+
+
+def test_round_trip_and_expiry(tmp_path):
+    cache = PageCache(str(tmp_path), default_ttl_seconds=60, zone_ttl_seconds={"short": -1})
+    cache.set("zone", "https://a", "<html>a</html>")
+    cache.set("short", "https://b", "<html>b</html>")
+
+    assert cache.get("zone", "https://a") == "<html>a</html>"
+    assert cache.get("short", "https://b") is None
+    assert cache.stats()["items"] == 1
+
+
+def test_writes_purge_expired_pages_from_disk(tmp_path):
+    cache = PageCache(str(tmp_path), zone_ttl_seconds={"short": -1})
+    cache.set("short", "https://old", "<html>old</html>")
+    cache._next_purge_at = 0.0
+
+    cache.set("zone", "https://new", "<html>new</html>")
+
+    assert len(_body_files(str(tmp_path))) == 1
+    assert cache.stats()["expired"] == 1
+
+
+def test_opening_the_cache_purges_expired_pages(tmp_path):
+    cache = PageCache(str(tmp_path), zone_ttl_seconds={"short": -1})
+    cache.set("short", "https://old", "<html>old</html>")
+    cache.set("zone", "https://new", "<html>new</html>")
+    assert len(_body_files(str(tmp_path))) == 2
+
+    reopened = PageCache(str(tmp_path))
+
+    assert len(_body_files(str(tmp_path))) == 1
+    assert reopened.stats()["bytes"] == os.path.getsize(reopened._path(PageCache.make_key("zone", "https://new"), reopened.codec))
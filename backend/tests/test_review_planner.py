@@ -0,0 +1,70 @@
+import asyncio
+from services.review_planner import ReviewPageFetcher, plan_review_pages
+
+
+def test_no_more_pages_when_page_one_meets_the_target():
+    assert plan_review_pages(target=10, first_page_reviews=10, page_size=10, total_pages=50) == []
+
+
+def test_pages_cover_the_remaining_target_with_overfetch():
+    # 90 more at 10 per page is 9 pages, padded by 20% to 11
+    assert plan_review_pages(target=100, first_page_reviews=10, page_size=10, total_pages=50, max_pages=50) == list(range(2, 13))
+
+
+def test_estimate_uses_the_usable_reviews_seen_on_page_one():
+    # only 5 of 10 reviews were usable, so twice as many pages are needed
+    assert plan_review_pages(target=30, first_page_reviews=5, page_size=10, total_pages=50, overfetch=1.0) == list(range(2, 7))
+
+
+def test_pages_are_capped_by_what_the_product_has_and_max_pages():
+    assert plan_review_pages(target=100, first_page_reviews=10, page_size=10, total_pages=3) == [2, 3]
+    assert plan_review_pages(target=100, first_page_reviews=10, page_size=10, total_pages=1, review_count=35) == [2, 3, 4]
+    assert plan_review_pages(target=100, first_page_reviews=10, page_size=10, total_pages=50, max_pages=4) == [2, 3, 4]
+
+
+def test_fetcher_stops_starting_pages_once_the_target_is_met():
+    started = []
+
+    async def fetch_page(page):
+        started.append(page)
+        await asyncio.sleep(0.01)
+        return [f"{page}-{i}" for i in range(10)]
+
+    results = asyncio.run(ReviewPageFetcher(fetch_page, concurrency=2).run(list(range(2, 12)), target=30, collected=10))
+
+    assert sum(len(reviews) for reviews in results.values()) >= 20
+    assert len(started) < 10
+
+
+def test_fetcher_cancels_pages_still_in_flight():
+    cancelled = []
+
+    async def fetch_page(page):
+        try:
+            await asyncio.sleep(0 if page == 2 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(page)
+            raise
+        return ["review"] * 10
+
+    results = asyncio.run(asyncio.wait_for(ReviewPageFetcher(fetch_page, concurrency=3).run([2, 3, 4], target=10), 2))
+
+    assert list(results) == [2]
+    assert sorted(cancelled) == [3, 4]
+
+
+def test_fetcher_skips_failed_pages_and_reports_each_page():
+    seen = []
+
+    async def fetch_page(page):
+        if page == 3:
+            raise RuntimeError("blocked")
+        return [page]
+
+    async def on_page(page, reviews):
+        seen.append((page, reviews))
+
+    results = asyncio.run(ReviewPageFetcher(fetch_page, concurrency=1).run([2, 3, 4], target=10, on_page=on_page))
+
+    assert results == {2: [2], 4: [4]}
+    assert seen == [(2, [2]), (4, [4])]
@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+import services.pinecone_service as pinecone_module
+from core.config import get_settings
+from services.kv_cache import get_kv_cache
+from services.pinecone_service import PineconeService
+from services.review_service import ReviewExtractionService
+from services.review_watermarks import get_review_watermarks
+from services.seen_reviews import get_seen_review_set
+from services.vector_client import get_vector_client
+from services.vector_store import get_vector_store
+
+SINGLETONS = [get_settings, get_kv_cache, get_seen_review_set, get_vector_client, get_vector_store, get_review_watermarks]
+PRODUCT = {"id": "p1", "name": "Headphones", "url": "https://www.walmart.com/ip/headphones/123"}
+OTHER = {"id": "p2", "name": "Earbuds", "url": "https://www.amazon.com/earbuds/dp/B000000001"}
+
+
+class FakeEmbedder:
+    async def embed_many(self, texts):
+        return [[float(len(text) % 5 + 1), 1.0, 0.0, 0.0] for text in texts]
+
+
+def _review(i):
+    return {
+        "review_text": f"review number {i} with its own words {i * 7}",
+        "title": f"title {i}",
+        "rating": 4,
+        "review_date": f"1/{i + 1}/2024",
+        "author_name": f"author {i}",
+        "product_name": PRODUCT["name"],
+    }
+
+
+class Walmart:
+    """Serves the first `available` reviews, newest first, five per page"""
+
+    def __init__(self):
+        self.available = 0
+        self.pages = []
+
+    def newest_first(self):
+        return [_review(i) for i in reversed(range(self.available))]
+
+    async def all_reviews(self, product, emit=None):
+        return self.newest_first()
+
+    async def page(self, url, product_name):
+        page = int(url.rsplit("page=", 1)[1])
+        self.pages.append(page)
+        return self.newest_first()[(page - 1) * 5:page * 5]
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCAL_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("VECTOR_STORE_BACKEND", "local")
+    monkeypatch.setenv("PINECONE_REVIEWS_INDEX", "reviews")
+    monkeypatch.setenv("PINECONE_DISCOVERY_INDEX", "discovery")
+    monkeypatch.setenv("EMBEDDING_DIMENSION", "4")
+    monkeypatch.setenv("REVIEW_DEDUP_ENABLED", "false")
+    monkeypatch.setattr(pinecone_module, "get_embedding_backend", lambda: FakeEmbedder())
+    for singleton in SINGLETONS:
+        singleton.cache_clear()
+
+    walmart = Walmart()
+    service = ReviewExtractionService(
+        bright_data_client=object(),
+        pinecone_service=PineconeService(),
+        gemini_model=object(),
+        snapshot_manager=object()
+    )
+    service._extract_walmart_reviews = walmart.all_reviews
+    service._extract_walmart_page_reviews_bs = walmart.page
+    service._extract_amazon_reviews = lambda product, emit=None: asyncio.sleep(0, result=[])
+
+    yield service, walmart
+
+    for singleton in SINGLETONS:
+        singleton.cache_clear()
+
+
+def _texts(reviews):
+    return sorted(review["review_text"] for review in reviews)
+
+
+def test_refresh_fetches_only_new_reviews(service):
+    service, walmart = service
+    selected = {"walmart": PRODUCT}
+    walmart.available = 12
+
+    assert len(asyncio.run(service.extract_reviews_for_products(selected))["walmart"]) == 12
+
+    walmart.available = 14
+    refreshed = asyncio.run(service.extract_reviews_for_products(selected, refresh=True))
+
+    assert _texts(refreshed["walmart"]) == _texts([_review(i) for i in range(14)])
+    # the two new reviews and the first known one are all on page 1
+    assert walmart.pages == [1]
+
+
+def test_refresh_with_nothing_new_keeps_the_stored_reviews(service):
+    service, walmart = service
+    selected = {"walmart": PRODUCT}
+    walmart.available = 4
+    asyncio.run(service.extract_reviews_for_products(selected))
+
+    refreshed = asyncio.run(service.extract_reviews_for_products(selected, refresh=True))
+
+    assert len(refreshed["walmart"]) == 4
+    assert walmart.pages == [1]
+
+
+def test_watermarks_are_not_shared_between_comparisons(service):
+    service, walmart = service
+    comparison_a = {"walmart": PRODUCT}
+    comparison_b = {"walmart": PRODUCT, "amazon": OTHER}
+
+    walmart.available = 3
+    asyncio.run(service.extract_reviews_for_products(comparison_b))
+    walmart.available = 6
+    asyncio.run(service.extract_reviews_for_products(comparison_a))
+
+    walmart.available = 8
+    refreshed = asyncio.run(service.extract_reviews_for_products(comparison_b, refresh=True))
+
+    assert _texts(refreshed["walmart"]) == _texts([_review(i) for i in range(8)])
@@ -0,0 +1,22 @@
+from services.seen_reviews import SeenReviewSet, make_review_id
+
+
+def test_review_ids_ignore_case_and_whitespace():
+    review = {"review_text": "Great  Sound", "author_name": "Ann", "review_date": "1/2/2024"}
+    same = {"review_text": "great sound ", "author_name": "ann", "review_date": "1/2/2024"}
+
+    assert make_review_id("amazon", "p1", review) == make_review_id("amazon", "p1", same)
+    assert make_review_id("amazon", "p1", review) != make_review_id("walmart", "p1", review)
+
+
+def test_only_recent_namespaces_stay_in_memory(tmp_path):
+    seen = SeenReviewSet(str(tmp_path / "seen.sqlite3"), max_namespaces=2)
+    seen.add("a", ["r1"])
+    seen.add("b", ["r2"])
+    seen.filter_unseen("a", [])
+    seen.add("c", ["r3"])
+
+    assert list(seen._loaded) == ["a", "c"]
+    # evicted namespaces reload from sqlite
+    assert seen.filter_unseen("b", ["r2", "r4"]) == ["r4"]
+    assert len(seen._loaded) == 2
@@ -0,0 +1,204 @@
+import asyncio
+from services.brightdata import SnapshotDownload
+from services.snapshot_manager import SnapshotManager
+
+AMAZON = "https://www.amazon.com/item/dp/{}"
+
+
+class FakeBrightData:
+    """Triggers numbered snapshots and serves their rows once `ready_after` polls have happened"""
+
+    def __init__(self, rows=None, ready_after=0, trigger_delay=0):
+        self.rows = rows or {}
+        self.ready_after = ready_after
+        self.trigger_delay = trigger_delay
+        self.triggers = []
+        self.polls = 0
+        self.rows_read = 0
+
+    async def trigger_dataset(self, dataset_id, inputs, notify_url=None, notify_secret=None):
+        self.triggers.append([item["url"] for item in inputs])
+        await asyncio.sleep(self.trigger_delay)
+        return f"s{len(self.triggers)}"
+
+    async def stream_snapshot(self, snapshot_id, on_row):
+        self.polls += 1
+        if self.polls <= self.ready_after:
+            return None
+        download = SnapshotDownload()
+        for row in self.rows.get(snapshot_id, []):
+            download.rows += 1
+            self.rows_read += 1
+            if on_row(row):
+                download.cutoff = True
+                break
+        return download
+
+
+def _manager(bright_data, **kwargs):
+    options = dict(batch_window_seconds=0.01, poll_min_seconds=0.01, poll_max_seconds=0.02, timeout_seconds=1.0)
+    options.update(kwargs)
+    return SnapshotManager(bright_data, dataset_id="dataset", **options)
+
+
+def _review(asin, text):
+    return {"url": AMAZON.format(asin), "review_text": text}
+
+
+def test_urls_in_one_window_share_a_trigger_and_get_their_own_rows():
+    bright_data = FakeBrightData(rows={"s1": [
+        _review("B000000001", "one"),
+        _review("B000000002", "two"),
+        {"url": AMAZON.format("B000000001"), "review_text": ""},
+        _review("B000000001", "three"),
+    ]})
+
+    async def scenario():
+        manager = _manager(bright_data)
+        first, second = await asyncio.gather(
+            manager.collect(AMAZON.format("B000000001") + "?ref=x"),
+            manager.collect(AMAZON.format("B000000002")),
+        )
+        return manager, first, second
+
+    manager, first, second = asyncio.run(scenario())
+
+    assert len(bright_data.triggers) == 1
+    assert [row["review_text"] for row in first] == ["one", "three"]
+    assert [row["review_text"] for row in second] == ["two"]
+    assert manager.stats()["batched_urls"] == 2
+
+
+def test_full_batches_trigger_without_waiting_for_the_window():
+    bright_data = FakeBrightData()
+
+    async def scenario():
+        manager = _manager(bright_data, batch_window_seconds=10, max_batch_size=2)
+        return await asyncio.wait_for(asyncio.gather(
+            manager.collect(AMAZON.format("B000000001")),
+            manager.collect(AMAZON.format("B000000002")),
+        ), 2)
+
+    assert asyncio.run(scenario()) == [[], []]
+    assert len(bright_data.triggers) == 1
+
+
+def test_repeated_product_urls_are_coalesced():
+    bright_data = FakeBrightData(rows={"s1": [_review("B000000001", "one")]})
+
+    async def scenario():
+        manager = _manager(bright_data)
+        results = await asyncio.gather(
+            manager.collect(AMAZON.format("B000000001")),
+            manager.collect("https://www.amazon.com/other-title/dp/B000000001/"),
+        )
+        return manager, results
+
+    manager, results = asyncio.run(scenario())
+
+    assert bright_data.triggers == [[AMAZON.format("B000000001")]]
+    assert results[0] == results[1] == [_review("B000000001", "one")]
+    assert manager.stats()["coalesced_urls"] == 1
+
+
+def test_download_stops_once_every_product_has_enough_rows():
+    rows = [_review("B000000001", f"review {i}") for i in range(10)]
+    bright_data = FakeBrightData(rows={"s1": rows})
+
+    async def scenario():
+        manager = _manager(bright_data, max_rows_per_url=3)
+        return manager, await manager.collect(AMAZON.format("B000000001"))
+
+    manager, result = asyncio.run(scenario())
+
+    assert len(result) == 3
+    assert bright_data.rows_read == 3
+    assert manager.stats()["early_cutoffs"] == 1
+
+
+def test_polls_until_ready():
+    bright_data = FakeBrightData(rows={"s1": [_review("B000000001", "one")]}, ready_after=2)
+
+    async def scenario():
+        manager = _manager(bright_data)
+        return manager, await manager.collect(AMAZON.format("B000000001"))
+
+    manager, result = asyncio.run(scenario())
+
+    assert result == [_review("B000000001", "one")]
+    assert manager.stats()["polls"] == 3
+
+
+def test_ready_snapshot_without_rows_completes_immediately():
+    bright_data = FakeBrightData(rows={"s1": []})
+
+    async def scenario():
+        manager = _manager(bright_data, timeout_seconds=5.0)
+        return manager, await asyncio.wait_for(manager.collect(AMAZON.format("B000000001")), 1)
+
+    manager, result = asyncio.run(scenario())
+
+    assert result == []
+    assert manager.stats()["polls"] == 1
+    assert manager.stats()["timeouts"] == 0
+
+
+def test_snapshots_that_never_become_ready_time_out():
+    bright_data = FakeBrightData(ready_after=1000)
+
+    async def scenario():
+        manager = _manager(bright_data, timeout_seconds=0.1)
+        return manager, await manager.collect(AMAZON.format("B000000001"))
+
+    manager, result = asyncio.run(scenario())
+
+    assert result == []
+    assert manager.stats()["timeouts"] == 1
+    assert manager.stats()["pending_snapshots"] == 0
+
+
+def test_webhook_rows_complete_a_pending_snapshot():
+    bright_data = FakeBrightData(ready_after=1000)
+
+    async def scenario():
+        manager = _manager(bright_data, poll_min_seconds=5, poll_max_seconds=5)
+        collecting = asyncio.create_task(manager.collect(AMAZON.format("B000000001")))
+        while not manager._snapshots:
+            await asyncio.sleep(0.01)
+        assert manager.notify("unknown", []) is False
+        assert manager.notify("s1", [_review("B000000001", "pushed")]) is True
+        return await asyncio.wait_for(collecting, 1)
+
+    assert asyncio.run(scenario()) == [_review("B000000001", "pushed")]
+
+
+def test_stats_keep_unknown_skipped_bytes_apart():
+    manager = _manager(FakeBrightData())
+    manager.counters.record_download(SnapshotDownload(rows=5, bytes_read=100, bytes_skipped=400, cutoff=True))
+    manager.counters.record_download(SnapshotDownload(rows=5, bytes_read=100, bytes_skipped=None, cutoff=True))
+
+    stats = manager.stats()
+
+    assert stats["bytes_skipped"] == 400
+    assert stats["early_cutoffs"] == 2
+    assert stats["cutoffs_unknown_size"] == 1
+
+
+def test_requests_during_a_trigger_attach_to_it():
+    bright_data = FakeBrightData(rows={"s1": [_review("B000000001", "one")]}, trigger_delay=0.1)
+
+    async def scenario():
+        manager = _manager(bright_data)
+        first = asyncio.create_task(manager.collect(AMAZON.format("B000000001")))
+        # past the batch window, while trigger_dataset has not returned a snapshot id yet
+        await asyncio.sleep(0.05)
+        assert manager.stats()["triggering"] == 1
+        second = await manager.collect(AMAZON.format("B000000001"))
+        return manager, await first, second
+
+    manager, first, second = asyncio.run(scenario())
+
+    assert len(bright_data.triggers) == 1
+    assert [row["review_text"] for row in first] == [row["review_text"] for row in second] == ["one"]
+    assert manager.stats()["coalesced_urls"] == 1
+    assert manager.stats()["triggering"] == 0
@@ -0,0 +1,74 @@
+import asyncio
+import json
+from services.brightdata import BrightDataClient
+
+ROWS = b"".join(json.dumps({"review_text": f"review {i}"}).encode() + b"\n" for i in range(200))
+
+
+class FakeContent:
+    def __init__(self, body):
+        self.body = body
+
+    async def iter_chunked(self, size):
+        for i in range(0, len(self.body), 64):
+            yield self.body[i:i + 64]
+
+
+class FakeResponse:
+    def __init__(self, body, content_length):
+        self.status = 200
+        self.content = FakeContent(body)
+        self.content_length = content_length
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def close(self):
+        pass
+
+
+class FakeTransport:
+    def __init__(self, body, content_length):
+        self.response = FakeResponse(body, content_length)
+
+    async def session(self):
+        return self
+
+    def get(self, *args, **kwargs):
+        return self.response
+
+
+def _stream(content_length, stop_after=None):
+    client = BrightDataClient(transport=FakeTransport(ROWS, content_length), page_cache=object(), serp_cache=object())
+    rows = []
+
+    def on_row(row):
+        rows.append(row)
+        return stop_after is not None and len(rows) >= stop_after
+
+    return asyncio.run(client.stream_snapshot("s1", on_row)), rows
+
+
+def test_full_download_skips_nothing():
+    download, rows = _stream(content_length=None)
+
+    assert len(rows) == download.rows == 200
+    assert not download.cutoff
+    assert download.bytes_skipped == 0
+
+
+def test_cutoff_with_content_length_counts_skipped_bytes():
+    download, rows = _stream(content_length=len(ROWS), stop_after=5)
+
+    assert download.cutoff and len(rows) == 5
+    assert download.bytes_skipped == len(ROWS) - download.bytes_read > 0
+
+
+def test_cutoff_on_chunked_download_reports_skipped_bytes_as_unknown():
+    download, _ = _stream(content_length=None, stop_after=5)
+
+    assert download.cutoff
+    assert download.bytes_skipped is None
@@ -0,0 +1,62 @@
+import pytest
+from fastapi.testclient import TestClient
+import dependencies
+import main
+from core.config import get_settings
+
+URL = "/api/v1/reviews/snapshots/webhook"
+
+
+class RecordingManager:
+    def __init__(self):
+        self.notified = []
+
+    def notify(self, snapshot_id, rows=None):
+        self.notified.append((snapshot_id, rows))
+        return True
+
+
+@pytest.fixture
+def client(monkeypatch):
+    manager = RecordingManager()
+    main.app.dependency_overrides[dependencies.get_snapshot_manager] = lambda: manager
+
+    def configure(url="", secret=""):
+        monkeypatch.setenv("SNAPSHOT_WEBHOOK_URL", url)
+        monkeypatch.setenv("SNAPSHOT_WEBHOOK_SECRET", secret)
+        get_settings.cache_clear()
+
+    yield TestClient(main.app), manager, configure
+
+    main.app.dependency_overrides.clear()
+    get_settings.cache_clear()
+
+
+def test_webhook_is_not_found_without_a_webhook_url(client):
+    http, manager, configure = client
+    configure(url="", secret="secret")
+
+    assert http.post(URL, json=[{"review_text": "x"}], params={"snapshot_id": "s1"}).status_code == 404
+    assert manager.notified == []
+
+
+def test_webhook_rejects_every_call_without_a_secret(client):
+    http, manager, configure = client
+    configure(url="https://example.com/hook", secret="")
+
+    response = http.post(URL, json=[{"review_text": "x"}], params={"snapshot_id": "s1"}, headers={"Authorization": ""})
+
+    assert response.status_code == 401
+    assert manager.notified == []
+
+
+def test_webhook_requires_the_matching_secret(client):
+    http, manager, configure = client
+    configure(url="https://example.com/hook", secret="secret")
+    rows = [{"review_text": "x"}]
+
+    assert http.post(URL, json=rows, params={"snapshot_id": "s1"}, headers={"Authorization": "wrong"}).status_code == 401
+    response = http.post(URL, json=rows, params={"snapshot_id": "s1"}, headers={"Authorization": "secret"})
+
+    assert response.json() == {"snapshot_id": "s1", "accepted": True}
+    assert manager.notified == [("s1", rows)]
@@ -0,0 +1,94 @@
+from extractors import amazon
+from extractors.spec import ExtractionSpec, Field, Rule, to_int, to_price
+
+
+def test_highest_priority_rule_wins_regardless_of_document_order():
+    spec = ExtractionSpec(fields=[
+        Field("price", [
+            Rule("span.primary", pattern=r"\$([\d,.]+)", convert=to_price),
+            Rule("span.secondary", pattern=r"\$([\d,.]+)", convert=to_price),
+        ]),
+    ])
+    html = '<div><span class="secondary">$2.00</span><span class="primary">$1,001.50</span></div>'
+
+    assert spec.extract(html) == {"price": 1001.5}
+
+
+def test_later_rules_fill_in_when_earlier_ones_yield_nothing():
+    spec = ExtractionSpec(fields=[
+        Field("count", [
+            Rule("span#count", pattern=r"([\d,]+)", convert=to_int),
+            Rule("a[aria-label]", attr="aria-label", pattern=r"([\d,]+)", convert=to_int),
+        ], default=0),
+        Field("image", [Rule("img", attr="src")]),
+        Field("missing", [Rule("p.none")], default="fallback"),
+    ])
+    html = '<span id="count">no digits</span><a aria-label="1,234 reviews">x</a><img src="a.jpg">'
+
+    assert spec.extract(html) == {"count": 1234, "image": "a.jpg", "missing": "fallback"}
+
+
+def test_limit_bounds_how_many_matches_are_tried():
+    spec = ExtractionSpec(fields=[Field("rating", [Rule("span", pattern=r"(\d) stars", convert=int, limit=2)])])
+
+    assert spec.extract("<span>a</span><span>b</span><span>4 stars</span>")["rating"] is None
+    assert spec.extract("<span>a</span><span>4 stars</span>")["rating"] == 4
+
+
+def test_full_page_rules_run_only_for_fields_the_fragment_left_empty():
+    calls = []
+
+    def from_body(tag):
+        calls.append(tag.name)
+        return tag.get_text(strip=True)
+
+    spec = ExtractionSpec(
+        fragment="//h1",
+        fields=[
+            Field("title", [Rule("h1"), Rule("title", extract=from_body, full_page=True)]),
+            Field("note", [Rule("p.note", extract=from_body, full_page=True)]),
+        ]
+    )
+
+    values = spec.extract("<html><head><title>Page</title></head><body><h1>Name</h1><p class='note'>n</p></body></html>")
+
+    assert values == {"title": "Name", "note": "n"}
+    assert calls == ["p"]
+
+
+def test_amazon_price_falls_back_to_any_text_in_the_page():
+    html = "<html><body><div>Price now $12.99</div><p>was $15.00</p></body></html>"
+
+    assert amazon.parse_product_page(html, "https://www.amazon.com/dp/B000000001")["price"] == 12.99
+
+
+def test_amazon_price_prefers_offscreen_then_only_the_first_price_to_pay():
+    offscreen = '<span class="a-offscreen">$5.49</span><div>$12.99</div>'
+    price_to_pay = '<span class="priceToPay"><span class="a-price-whole">7</span><span class="a-price-fraction">25</span></span>'
+    second_price_to_pay = (
+        '<span class="priceToPay"><span class="a-price-whole">7</span></span>'
+        '<span class="priceToPay"><span class="a-price-whole">9</span><span class="a-price-fraction">99</span></span>'
+    )
+
+    assert amazon.parse_product_page(offscreen, "u")["price"] == 5.49
+    assert amazon.parse_product_page(price_to_pay, "u")["price"] == 7.25
+    assert amazon.parse_product_page(second_price_to_pay, "u")["price"] is None
+
+
+def test_amazon_rating_and_review_count():
+    html = (
+        '<span id="productTitle"> Headphones </span>'
+        '<i data-hook="average-star-rating"><span class="a-icon-alt">4.6 out of 5 stars</span></i>'
+        '<span id="acrCustomerReviewText">12,345 ratings</span>'
+    )
+    values = amazon.parse_product_page(html, "u")
+
+    assert (values["name"], values["rating"], values["review_count"]) == ("Headphones", 4.6, 12345)
+
+
+def test_amazon_rating_fallback_scans_a_bounded_number_of_spans():
+    near = "<span>filler</span>" * 10 + "<span>4.2 out of 5</span>"
+    far = "<span>filler</span>" * 2000 + "<span>4.2 out of 5</span>"
+
+    assert amazon.parse_product_page(near, "u")["rating"] == 4.2
+    assert amazon.parse_product_page(far, "u")["rating"] == 0.0
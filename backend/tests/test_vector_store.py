@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from services.vector_store import LocalVectorIndex
+
+
+def _vector(*values, dimension=4):
+    return list(values) + [0.0] * (dimension - len(values))
+
+
+@pytest.fixture
+def index(tmp_path):
+    return LocalVectorIndex(str(tmp_path / "index"), dimension=4)
+
+
+def test_query_ranks_by_cosine_similarity(index):
+    index.upsert([
+        {"id": "x", "values": _vector(1, 0), "metadata": {}},
+        {"id": "xy", "values": _vector(1, 1), "metadata": {}},
+        {"id": "y", "values": _vector(0, 1), "metadata": {}},
+    ])
+
+    result = index.query(_vector(2, 0), top_k=2)
+
+    assert [match.id for match in result.matches] == ["x", "xy"]
+    assert result.matches[0].score == pytest.approx(1.0)
+    assert result.matches[1].score == pytest.approx(np.sqrt(0.5))
+
+
+def test_namespaces_are_isolated(index):
+    index.upsert([{"id": "a", "values": _vector(1), "metadata": {"n": "one"}}], namespace="one")
+    index.upsert([{"id": "a", "values": _vector(0, 1), "metadata": {"n": "two"}}], namespace="two")
+
+    assert [m.metadata["n"] for m in index.query(_vector(1), top_k=5, namespace="one").matches] == ["one"]
+    assert index.fetch(["a"], namespace="two").vectors["a"].metadata == {"n": "two"}
+    assert index.query(_vector(1), top_k=5).matches == []
+    assert list(index.list(namespace="one")) == [["a"]]
+
+
+def test_equality_and_range_filters(index):
+    index.upsert([
+        {"id": "a", "values": _vector(1), "metadata": {"store": "amazon", "expires_at": 10}},
+        {"id": "b", "values": _vector(1), "metadata": {"store": "walmart", "expires_at": 20}},
+        {"id": "c", "values": _vector(1), "metadata": {"store": "amazon", "expires_at": 30}},
+    ])
+
+    def ids(filter):
+        return sorted(match.id for match in index.query(_vector(1), top_k=10, filter=filter).matches)
+
+    assert ids({"store": "amazon"}) == ["a", "c"]
+    assert ids({"store": {"$eq": "walmart"}}) == ["b"]
+    assert ids({"expires_at": {"$gt": 15}}) == ["b", "c"]
+    assert ids({"store": "amazon", "expires_at": {"$lt": 15}}) == ["a"]
+    assert ids({"store": {"$in": ["walmart", "other"]}}) == ["b"]
+
+
+def test_upsert_replaces_metadata_and_postings(index):
+    index.upsert([{"id": "a", "values": _vector(1), "metadata": {"store": "amazon"}}])
+    index.upsert([{"id": "a", "values": _vector(0, 1), "metadata": {"store": "walmart"}}])
+
+    assert index.count() == 1
+    assert index.query(_vector(1), top_k=5, filter={"store": "amazon"}).matches == []
+    fetched = index.fetch(["a"]).vectors["a"]
+    assert fetched.metadata == {"store": "walmart"}
+    assert fetched.values[:2] == pytest.approx([0.0, 1.0])
+
+
+def test_deleted_rows_are_reused(index):
+    index.upsert([
+        {"id": "a", "values": _vector(1), "metadata": {"store": "amazon"}},
+        {"id": "b", "values": _vector(0, 1), "metadata": {}},
+    ])
+    index.delete(["a", "missing"])
+    index.upsert([{"id": "c", "values": _vector(0, 0, 1), "metadata": {}}])
+
+    assert index.count() == 2
+    assert index.fetch(["a"]).vectors == {}
+    assert index.query(_vector(1), top_k=5, filter={"store": "amazon"}).matches == []
+    # the new vector took the freed row instead of growing the matrix
+    assert index._size == 2
+    assert index.query(_vector(0, 0, 1), top_k=1).matches[0].id == "c"
+
+
+def test_reopen_restores_vectors_metadata_and_free_rows(tmp_path):
+    path = str(tmp_path / "index")
+    index = LocalVectorIndex(path, dimension=4)
+    index.upsert([
+        {"id": "a", "values": _vector(1), "metadata": {"store": "amazon"}},
+        {"id": "b", "values": _vector(0, 1), "metadata": {"store": "walmart"}},
+    ], namespace="ns")
+    index.delete(["a"], namespace="ns")
+
+    reopened = LocalVectorIndex(path, dimension=4)
+
+    assert reopened.count() == 1
+    matches = reopened.query(_vector(0, 1), top_k=5, namespace="ns", filter={"store": "walmart"}).matches
+    assert [match.id for match in matches] == ["b"]
+    assert matches[0].score == pytest.approx(1.0)
+    assert reopened._free_rows == [0]
@@ -0,0 +1,47 @@
+from typing import Optional
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+HTML_PARSER = "lxml" if HAS_LXML else "html.parser"
+
+
+def parse_html(html: str, only: Optional[str] = None) -> BeautifulSoup:
+    """Parses html into a BeautifulSoup tree using the fastest parser available.
+
+    When `only` is an XPath expression and lxml is installed, the page is first
+    parsed by lxml and only the matching subtrees (outermost match wins) are
+    turned into the BeautifulSoup tree, which is much cheaper than building
+    the full tree for multi-megabyte retail pages. Without lxml, or when the
+    selection fails, the full page is parsed.
+    """
+    if only and HAS_LXML and html:
+        try:
+            return BeautifulSoup(_select_fragments(html, only), HTML_PARSER)
+        except (etree.ParserError, etree.XPathError, ValueError) as e:
+            print(f"Partial parse failed, parsing full page: {e}")
+
+    return BeautifulSoup(html, HTML_PARSER)
+
+
+def _select_fragments(html: str, xpath: str) -> str:
+    root = lxml.html.document_fromstring(html)
+    matches = root.xpath(xpath)
+
+    selected = set()
+    fragments = []
+    for element in matches:
+        if not isinstance(element, etree._Element):
+            continue
+        # nested matches are already part of their selected ancestor
+        if any(ancestor in selected for ancestor in element.iterancestors()):
+            continue
+        selected.add(element)
+        fragments.append(lxml.html.tostring(element, encoding="unicode", with_tail=False))
+
+    return "<html><body>" + "".join(fragments) + "</body></html>"
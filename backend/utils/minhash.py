@@ -0,0 +1,108 @@
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+import re
+import zlib
+import numpy as np
+
+T = TypeVar('T')
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+
+
+class MinHashDeduplicator:
+    """Collapses near-duplicate texts with MinHash signatures and LSH banding.
+
+    Each text is reduced to word shingles, hashed into a fixed-size MinHash
+    signature, and bucketed by signature bands. Only texts sharing a bucket
+    are compared, so the work stays roughly linear in the number of texts.
+    """
+
+    MAX_BUCKET_SIZE = 8
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 3, threshold: float = 0.8, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        text = text.casefold()
+        tokens = _TOKEN_RE.findall(text)
+        if not tokens:
+            # emoji or punctuation only, compare by characters instead
+            chars = "".join(text.split())
+            if not chars:
+                return np.empty(0, dtype=np.uint64)
+            grams = [chars[i:i + self.shingle_size] for i in range(max(len(chars) - self.shingle_size + 1, 1))]
+        elif len(tokens) < self.shingle_size:
+            grams = [" ".join(tokens)]
+        else:
+            grams = [" ".join(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)]
+        return np.fromiter({zlib.crc32(gram.encode("utf-8")) for gram in grams}, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of the text, None when it has nothing to compare"""
+        shingles = self._shingles(text)
+        if shingles.size == 0:
+            return None
+        hashed = (np.outer(shingles, self._a) + self._b) % _PRIME
+        return hashed.min(axis=0)
+
+    def group(self, texts: Sequence[str]) -> List[int]:
+        """Returns, for every text, the index of the first text it duplicates (itself if unique)"""
+        signatures = [self.signature(text) for text in texts]
+        parent = list(range(len(texts)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        for i, signature in enumerate(signatures):
+            # a text without shingles is never grouped with anything
+            if signature is None:
+                continue
+            for band in range(self.bands):
+                key = (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                members = buckets.setdefault(key, [])
+                for other in members:
+                    root_i, root_other = find(i), find(other)
+                    if root_i != root_other and np.mean(signatures[other] == signature) >= self.threshold:
+                        # the earliest text stays the representative
+                        parent[max(root_i, root_other)] = min(root_i, root_other)
+                # bounding bucket size keeps skewed buckets from going quadratic
+                if len(members) < self.MAX_BUCKET_SIZE:
+                    members.append(i)
+
+        return [find(i) for i in range(len(texts))]
+
+    def deduplicate(self, items: List[T], text: Callable[[T], str]) -> Tuple[List[T], Dict[int, int]]:
+        """Keeps the first item of every near-duplicate group.
+
+        Returns the kept items and a map from kept position to the number of
+        duplicates collapsed into it.
+        """
+        groups = self.group([text(item) or "" for item in items])
+
+        kept: List[T] = []
+        kept_position: Dict[int, int] = {}
+        duplicate_counts: Dict[int, int] = {}
+        for i, (item, root) in enumerate(zip(items, groups)):
+            if root == i:
+                kept_position[i] = len(kept)
+                kept.append(item)
+            else:
+                position = kept_position[root]
+                duplicate_counts[position] = duplicate_counts.get(position, 0) + 1
+
+        return kept, duplicate_counts